@@ -0,0 +1,66 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from leitura_chat import extrair_dia_semana, extrair_hora
+from desempenho import cronometrado
+
+
+class Agregados(NamedTuple):
+    """
+    Contagens de mensagens pré-agregadas por participante, calculadas uma vez por conversa.
+    Os gráficos são desenhados a partir destas tabelas, cujo tamanho não depende do número
+    de mensagens.
+    """
+    mensal: Optional[pd.DataFrame]    # índice (Telefone, Mês); uma coluna por sentimento
+    por_hora: pd.DataFrame            # índice Telefone; colunas 0..23
+    por_dia_semana: pd.DataFrame      # índice Telefone; colunas 0..6 (0 = segunda-feira)
+    por_periodo: Optional[pd.Series]  # índice (Telefone, Semestre, Periodo_Semestre)
+
+
+def _contagem_por_codigo(codigos: np.ndarray, valores: np.ndarray, n_valores: int,
+                         participantes: pd.Index) -> pd.DataFrame:
+    """Tabela participante × valor (hora, dia da semana) contada com um único bincount."""
+    contagens = np.bincount(codigos * n_valores + valores, minlength=len(participantes) * n_valores)
+    return pd.DataFrame(
+        contagens.reshape(len(participantes), n_valores), index=participantes, columns=range(n_valores)
+    )
+
+
+@cronometrado('agregados')
+def construir_agregados(df: pd.DataFrame) -> Agregados:
+    """
+    Agrega o DataFrame de analyze_sentiments por participante e mês/sentimento, hora do dia,
+    dia da semana e, se a conversa foi classificada, semestre e período do semestre. Sem a
+    coluna sentimento (conversa ainda sem análise de sentimentos), mensal fica None.
+
+    Args:
+        df: DataFrame com Data_Hora e Telefone e, se já analisado, sentimento
+
+    Returns:
+        Agregados com as tabelas de contagens
+    """
+    telefones = df['Telefone'].astype('category')
+    participantes = pd.Index(telefones.cat.categories, name='Telefone')
+    codigos = telefones.cat.codes.to_numpy().astype(np.int64)
+
+    mensal = None
+    if 'sentimento' in df.columns:
+        meses = pd.Series(
+            df['Data_Hora'].to_numpy().astype('datetime64[M]'), index=df.index, name='Mês'
+        )
+        mensal = (
+            df.groupby([telefones, meses, df['sentimento']], observed=True)
+            .size()
+            .unstack('sentimento', fill_value=0)
+        )
+
+    por_hora = _contagem_por_codigo(codigos, extrair_hora(df).to_numpy(), 24, participantes)
+    por_dia_semana = _contagem_por_codigo(codigos, extrair_dia_semana(df).to_numpy(), 7, participantes)
+
+    por_periodo = None
+    if {'Semestre', 'Periodo_Semestre'}.issubset(df.columns):
+        por_periodo = df.groupby([telefones, 'Semestre', 'Periodo_Semestre'], observed=True).size()
+
+    return Agregados(mensal, por_hora, por_dia_semana, por_periodo)
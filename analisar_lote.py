@@ -0,0 +1,172 @@
+"""
+Análise em lote de conversas exportadas do WhatsApp, sem a interface do Streamlit.
+
+Processa todos os .txt e .zip (como exportados pelo WhatsApp) de um diretório, ou um único
+.zip, em um pool de processos e grava tabelas de resumo por conversa e por participante.
+
+Uso:
+    python analisar_lote.py exportacoes/ --saida resultados/ --workers 8
+"""
+import argparse
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from armazenamento import ArmazemParquet
+from auxiliar import estatisticas_sentimento, resumo_sentimentos
+from pipeline import analisar_chat
+
+# Uma tarefa é (rótulo, caminho do arquivo, membro do zip ou None)
+Tarefa = Tuple[str, str, Optional[str]]
+
+
+def listar_tarefas(entrada: str) -> List[Tarefa]:
+    """Lista as conversas de um diretório (recursivamente) ou de um arquivo .txt/.zip."""
+    if os.path.isdir(entrada):
+        caminhos = sorted(
+            os.path.join(raiz, nome)
+            for raiz, _, nomes in os.walk(entrada)
+            for nome in nomes
+            if nome.lower().endswith((".txt", ".zip"))
+        )
+    else:
+        caminhos = [entrada]
+
+    tarefas = []
+    for caminho in caminhos:
+        rotulo = os.path.relpath(caminho, entrada) if os.path.isdir(entrada) else os.path.basename(caminho)
+        if caminho.lower().endswith(".zip"):
+            try:
+                with zipfile.ZipFile(caminho) as arquivo_zip:
+                    membros = [m for m in arquivo_zip.namelist() if m.lower().endswith(".txt")]
+            except zipfile.BadZipFile:
+                print(f"Ignorando {rotulo}: não é um arquivo zip válido", file=sys.stderr)
+                continue
+            tarefas.extend(
+                (rotulo if len(membros) == 1 else f"{rotulo}/{membro}", caminho, membro) for membro in membros
+            )
+        else:
+            tarefas.append((rotulo, caminho, None))
+    return tarefas
+
+
+def processar(tarefa: Tarefa, diretorio_armazem: Optional[str] = None) -> Tuple[dict, pd.DataFrame]:
+    """Analisa uma conversa e retorna o resumo da conversa e o resumo por participante."""
+    rotulo, caminho, membro = tarefa
+    armazem = ArmazemParquet(diretorio_armazem) if diretorio_armazem else None
+
+    if membro is None:
+        df, _ = analisar_chat(caminho, armazem)
+    else:
+        with zipfile.ZipFile(caminho) as arquivo_zip, arquivo_zip.open(membro) as arquivo:
+            df, _ = analisar_chat(arquivo, armazem)
+
+    resumo_chat = {"chat": rotulo, "participantes": df["Telefone"].nunique()}
+    stats = estatisticas_sentimento(df)
+    resumo_chat.update(
+        {chave: valor for chave, valor in stats.items() if chave != "contagem_sentimentos"},
+        inicio=df["Data_Hora"].min(),
+        fim=df["Data_Hora"].max(),
+    )
+    for motivo, quantidade in df.attrs.get("descartes", {}).items():
+        resumo_chat[f"descartes_{motivo}"] = quantidade
+
+    participantes = resumo_sentimentos(df)
+    periodo = df.groupby("Telefone", observed=True)["Data_Hora"].agg(inicio="min", fim="max")
+    participantes = participantes.join(periodo).reset_index()
+    participantes["Telefone"] = participantes["Telefone"].astype(str)
+    participantes.insert(0, "chat", rotulo)
+    return resumo_chat, participantes
+
+
+def salvar(df: pd.DataFrame, caminho_base: str, formato: str) -> str:
+    caminho = f"{caminho_base}.{formato}"
+    if formato == "parquet":
+        df.to_parquet(caminho, index=False)
+    else:
+        df.to_csv(caminho, index=False, encoding="utf-8-sig")
+    return caminho
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("entrada", help="Diretório com exportações (.txt/.zip) ou um arquivo .txt/.zip")
+    parser.add_argument("--saida", default="resultados", help="Diretório das tabelas de resumo")
+    parser.add_argument("--formato", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--armazem", help="Diretório do armazém Parquet para reaproveitar análises anteriores")
+    args = parser.parse_args(argv)
+
+    tarefas = listar_tarefas(args.entrada)
+    if not tarefas:
+        print(f"Nenhuma conversa encontrada em {args.entrada}", file=sys.stderr)
+        return 1
+
+    resumos_chat, resumos_participantes, falhas = [], [], 0
+    pendentes = iter(tarefas)
+    em_andamento = {}
+    # Fila limitada: no máximo 2 tarefas por processo submetidas de cada vez
+    limite_fila = 2 * args.workers
+    inicio = time.perf_counter()
+    mensagens = 0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        while True:
+            while len(em_andamento) < limite_fila:
+                tarefa = next(pendentes, None)
+                if tarefa is None:
+                    break
+                em_andamento[executor.submit(processar, tarefa, args.armazem)] = tarefa
+            if not em_andamento:
+                break
+
+            concluidas, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+            for futuro in concluidas:
+                rotulo = em_andamento.pop(futuro)[0]
+                feitos = len(resumos_chat) + falhas + 1
+                try:
+                    resumo_chat, participantes = futuro.result()
+                except Exception as erro:
+                    falhas += 1
+                    print(f"[{feitos}/{len(tarefas)}] ERRO {rotulo}: {erro}", file=sys.stderr)
+                    continue
+                resumos_chat.append(resumo_chat)
+                resumos_participantes.append(participantes)
+                mensagens += resumo_chat["total_mensagens"]
+                decorrido = time.perf_counter() - inicio
+                print(
+                    f"[{feitos}/{len(tarefas)}] {rotulo}: {resumo_chat['total_mensagens']:,} mensagens · "
+                    f"{feitos / decorrido:.2f} arquivos/s · {mensagens / decorrido:,.0f} mensagens/s",
+                    file=sys.stderr,
+                )
+
+    if resumos_chat:
+        os.makedirs(args.saida, exist_ok=True)
+        chats = pd.DataFrame(resumos_chat)
+        # Motivos de descarte ausentes em uma conversa contam zero
+        colunas_descartes = [coluna for coluna in chats.columns if coluna.startswith("descartes_")]
+        chats[colunas_descartes] = chats[colunas_descartes].fillna(0).astype(int)
+        caminho_chats = salvar(chats, os.path.join(args.saida, "chats"), args.formato)
+        caminho_participantes = salvar(
+            pd.concat(resumos_participantes, ignore_index=True),
+            os.path.join(args.saida, "participantes"),
+            args.formato,
+        )
+        print(f"Resumos gravados em {caminho_chats} e {caminho_participantes}", file=sys.stderr)
+
+    decorrido = time.perf_counter() - inicio
+    print(
+        f"{len(resumos_chat)} conversas ({falhas} com erro) e {mensagens:,} mensagens em {decorrido:.1f}s · "
+        f"{len(tarefas) / decorrido:.2f} arquivos/s · {mensagens / decorrido:,.0f} mensagens/s",
+        file=sys.stderr,
+    )
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+from typing import Optional
+
+import pandas as pd
+
+# Diretório e limite de tamanho padrão do armazenamento em disco
+DIRETORIO_PADRAO = os.environ.get(
+    "ANALISEWPP_ARMAZEM", os.path.join(os.path.expanduser("~"), ".cache", "analisewpp")
+)
+LIMITE_PADRAO_MB = int(os.environ.get("ANALISEWPP_ARMAZEM_MB", "2048"))
+
+
+class ArmazemParquet:
+    """
+    Armazenamento local de conversas analisadas em Parquet, endereçado pelo hash do conteúdo
+    do arquivo exportado. Cada entrada é um arquivo <hash>.parquet; a data de modificação marca
+    o último uso e as entradas mais antigas são removidas quando o total passa de max_bytes.
+    Metadados opcionais de cada entrada ficam em <hash>.json.
+    """
+
+    EXTENSAO = ".parquet"
+    EXTENSAO_METADADOS = ".json"
+
+    def __init__(self, diretorio: str = DIRETORIO_PADRAO, max_bytes: int = LIMITE_PADRAO_MB * 1024 * 1024):
+        self.diretorio = diretorio
+        self.max_bytes = max_bytes
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave + self.EXTENSAO)
+
+    def _caminho_metadados(self, caminho: str) -> str:
+        return caminho[:-len(self.EXTENSAO)] + self.EXTENSAO_METADADOS
+
+    def __contains__(self, chave: str) -> bool:
+        return os.path.exists(self._caminho(chave))
+
+    def carregar(self, chave: str) -> Optional[pd.DataFrame]:
+        """Lê a entrada com memory map; retorna None se não existir ou estiver corrompida."""
+        caminho = self._caminho(chave)
+        try:
+            df = pd.read_parquet(caminho, memory_map=True)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # Arquivo truncado ou ilegível: descarta para que seja regravado
+            self._remover(caminho)
+            return None
+        os.utime(caminho)  # Marca como usado recentemente
+        return df
+
+    def salvar(self, chave: str, df: pd.DataFrame, metadados: Optional[dict] = None):
+        """Grava a entrada (e seus metadados) de forma atômica e aplica o limite de tamanho."""
+        caminho = self._caminho(chave)
+        if metadados is not None:
+            def gravar_metadados(temporario):
+                with open(temporario, "w", encoding="utf-8") as arquivo:
+                    json.dump(metadados, arquivo)
+            self._gravar_atomico(self._caminho_metadados(caminho), gravar_metadados)
+        self._gravar_atomico(caminho, lambda temporario: df.to_parquet(temporario, index=False))
+        self._despejar(manter=caminho)
+
+    def _gravar_atomico(self, destino: str, gravar):
+        """
+        Chama gravar(caminho) com um arquivo temporário exclusivo e o move para destino. As
+        sessões do Streamlit são threads do mesmo processo e podem salvar a mesma conversa ao
+        mesmo tempo, então cada gravação usa o seu próprio temporário.
+        """
+        descritor, temporario = tempfile.mkstemp(
+            dir=self.diretorio, prefix=os.path.basename(destino) + ".", suffix=".tmp"
+        )
+        os.close(descritor)
+        try:
+            gravar(temporario)
+            os.replace(temporario, destino)
+        finally:
+            self._remover(temporario)
+
+    def metadados(self, chave: str) -> Optional[dict]:
+        """Metadados gravados com a entrada, ou None."""
+        try:
+            with open(self._caminho_metadados(self._caminho(chave)), encoding="utf-8") as arquivo:
+                return json.load(arquivo)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def chaves(self) -> list:
+        """Hashes das entradas armazenadas."""
+        return [os.path.basename(caminho)[:-len(self.EXTENSAO)] for caminho, _, _ in self.entradas()]
+
+    def entradas(self) -> list:
+        """Lista (caminho, tamanho, último uso) das entradas, da menos para a mais recente."""
+        entradas = []
+        with os.scandir(self.diretorio) as itens:
+            for item in itens:
+                if item.name.endswith(self.EXTENSAO):
+                    info = item.stat()
+                    entradas.append((item.path, info.st_size, info.st_mtime))
+        return sorted(entradas, key=lambda entrada: entrada[2])
+
+    def tamanho_total(self) -> int:
+        return sum(tamanho for _, tamanho, _ in self.entradas())
+
+    def _despejar(self, manter: Optional[str] = None):
+        entradas = self.entradas()
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for caminho, tamanho, _ in entradas:
+            if total <= self.max_bytes:
+                break
+            if caminho != manter:
+                self._remover(caminho)
+                self._remover(self._caminho_metadados(caminho))
+                total -= tamanho
+
+    @staticmethod
+    def _remover(caminho: str):
+        try:
+            os.remove(caminho)
+        except FileNotFoundError:
+            pass
@@ -1,60 +1,28 @@
-import pandas as pd
-import re
-
-def process_whatsapp_chat(file):
-    lines = file.getvalue().decode("utf-8").split("\n")
-
-    # Padrão Android: "DD/MM/YYYY HH:MM - Nome: Mensagem"
-    pattern_android = re.compile(r'^(\d{2}/\d{2}/\d{4}) (\d{2}:\d{2}) - ([^:]+?): (.*)')
-    
-    # Padrão iOS: "[DD/MM/YYYY, HH:MM:SS] Nome: Mensagem"
-    pattern_ios = re.compile(r'^\[(\d{2}/\d{2}/\d{4}), (\d{2}:\d{2}:\d{2})\] ([^:]+?): (.*)')
-
-    data = []
-    current_entry = None
-    is_ios = False  # Flag para detectar se é formato iOS
-
-    for line in lines:
-        line = line.strip()
-        
-        # Tenta casar o padrão do Android
-        match_android = pattern_android.match(line)
-        
-        # Tenta casar o padrão do iOS
-        match_ios = pattern_ios.match(line)
-
-        if match_android:
-            if current_entry:
-                data.append(current_entry)
-
-            dia, horario, telefone, mensagem = match_android.groups()
-            current_entry = [dia, horario, telefone, mensagem]
-
-        elif match_ios:
-            is_ios = True  # Confirma que é iOS
-            if current_entry:
-                data.append(current_entry)
-
-            dia, horario, telefone, mensagem = match_ios.groups()
-            current_entry = [dia, horario, telefone, mensagem[:]]
-
-        elif current_entry:
-            current_entry[3] += '\n' + line  # Mensagem multilinha
-        
-    if current_entry:
-        data.append(current_entry)
+"""
+Classificação por semestre, análise de sentimentos e frequências de palavras.
 
-    df = pd.DataFrame(data, columns=['Dia', 'Horário', 'Telefone', 'Mensagem'])
+A leitura das conversas fica em leitura_chat e é reexportada aqui. nltk e textblob só são
+importados na primeira limpeza de texto ou análise de sentimentos.
+"""
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
 
-    # Conversão de data e hora
-    df['Dia'] = pd.to_datetime(df['Dia'], format='%d/%m/%Y').dt.date
-    df['Horário'] = pd.to_datetime(df['Horário'], format='%H:%M:%S' if is_ios else '%H:%M').dt.hour
-    
-    # Filtra mensagens irrelevantes
-    df = df[~df['Mensagem'].str.contains('<Mídia oculta>|Mensagem apagada|chat.whatsapp.com|https', na=False)]
-    df = df[df['Mensagem'].str.strip() != ""]
+import numpy as np
+import pandas as pd
 
-    return df
+from desempenho import cronometrado
+# A leitura continua disponível por auxiliar para quem já a importa daqui
+from leitura_chat import (
+    AMOSTRA_DIALETO, CHUNK_SIZE, EVENTOS_SISTEMA, FILTRO_PADRAO, MARCAS_EDICAO, MARCAS_INICIO_LINHA,
+    REGRAS_DESCARTE, SEPARADOR, TRECHOS_DESCARTE, Dialeto, FiltroMensagens, compilar_filtro,
+    detectar_dialeto, extrair_dia, extrair_dia_semana, extrair_hora, filtrar_mensagens, hash_arquivo,
+    hash_prefixos, iter_chat_batches, iter_line_chunks, obter_dialeto, para_esquema_antigo,
+    primeira_linha, process_whatsapp_chat
+)
 
 stopwords_pt = {
     "a", "e", "não", "o", "que", "vc", "à", "é", "só", "tá", "vai", "acho", "n","nan","bit", "pq","pra", "q", "adeus", "agora", "ainda", "além", "algo", "algum", "alguma", "algumas", "alguns",
@@ -100,113 +68,300 @@ stopwords_pt = {
     "vocês", "vos", "vossa", "vossas", "vosso", "vossos", "zero"
 }
 
-import pandas as pd
+# Calendário padrão de semestres (semestre, inicio, fim). Para outra instituição, basta
+# passar outro CSV com as mesmas colunas para classificar_mensagens.
+CALENDARIO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'calendario_semestres.csv')
 
-def classificar_mensagens(df):
-    # Definir períodos dos semestres
-    datas_semestres = [
-        ("2021/1", "2021-11-29", "2022-04-02"),
-        ("2021/2", "2022-05-02", "2022-08-20"),
-        ("2022/1", "2022-09-26", "2023-02-06"),
-        ("2022/2", "2023-02-27", "2023-06-29"),
-        ("2023/1", "2023-07-31", "2023-12-04"),
-        ("2023/2", "2024-01-08", "2024-04-25"),
-        ("2024/1", "2024-05-20", "2024-09-23"),
-        ("2024/2", "2024-11-09", "2025-05-15")
-    ]
-    
-    # Converter datas para datetime
-    datas_semestres = [(s, pd.to_datetime(i), pd.to_datetime(f)) for s, i, f in datas_semestres]
-    
-    def classificar_mensagem(data):
-        data = pd.to_datetime(data)  # Garantir que a data esteja no formato correto
-        for semestre, inicio, fim in datas_semestres:
-            if inicio <= data <= fim:
-                return semestre
-        return "Férias"
-    
-    def classificar_periodo(data):
-        data = pd.to_datetime(data)
-        for semestre, inicio, fim in datas_semestres:
-            if inicio <= data <= fim:
-                total_dias = (fim - inicio).days
-                quartil_25 = inicio + pd.Timedelta(days=total_dias * 0.25)
-                quartil_50 = inicio + pd.Timedelta(days=total_dias * 0.50)
-                quartil_75 = inicio + pd.Timedelta(days=total_dias * 0.75)
-                
-                if data <= quartil_25:
-                    return "25%"
-                elif data <= quartil_50:
-                    return "50%"
-                elif data <= quartil_75:
-                    return "75%"
-                else:
-                    return "100%"
-        return "Férias"
-    
-    # Aplicar a classificação
-    df['Semestre'] = df['Dia'].apply(classificar_mensagem)
-    df['Periodo_Semestre'] = df['Dia'].apply(classificar_periodo)
+# Rótulos dos quartis de cada semestre, na ordem em que são testados
+PERIODOS_SEMESTRE = ['25%', '50%', '75%', '100%']
+FERIAS = 'Férias'
+
+
+class CalendarioIndexado(NamedTuple):
+    """Limites dos semestres ordenados por início, prontos para busca com searchsorted."""
+    semestres: list
+    inicios: np.ndarray
+    fins: np.ndarray
+    quartis: np.ndarray  # matriz 3 x n com os cortes de 25%, 50% e 75%
+
+
+def carregar_calendario(calendario=None) -> pd.DataFrame:
+    """
+    Carrega o calendário de semestres como DataFrame com as colunas semestre, inicio e fim.
+
+    Args:
+        calendario: caminho de um CSV, DataFrame ou lista de tuplas (semestre, inicio, fim).
+            Se omitido, usa calendario_semestres.csv.
+    """
+    if calendario is None:
+        calendario = CALENDARIO_PADRAO
+    if isinstance(calendario, (str, os.PathLike)):
+        calendario = pd.read_csv(calendario, dtype={'semestre': str})
+    elif not isinstance(calendario, pd.DataFrame):
+        calendario = pd.DataFrame(list(calendario), columns=['semestre', 'inicio', 'fim'])
+
+    calendario = calendario[['semestre', 'inicio', 'fim']].copy()
+    calendario['inicio'] = pd.to_datetime(calendario['inicio'])
+    calendario['fim'] = pd.to_datetime(calendario['fim'])
+    if calendario['semestre'].duplicated().any():
+        raise ValueError("O calendário contém semestres repetidos")
+    return calendario
+
+
+def indexar_calendario(calendario=None) -> CalendarioIndexado:
+    """Ordena o calendário e pré-calcula os cortes dos quartis de cada semestre."""
+    calendario = carregar_calendario(calendario).sort_values('inicio', kind='stable')
+    inicios = calendario['inicio'].to_numpy(dtype='datetime64[ns]')
+    fins = calendario['fim'].to_numpy(dtype='datetime64[ns]')
+
+    total_dias = (calendario['fim'] - calendario['inicio']).dt.days.to_numpy()
+    quartis = np.stack([
+        inicios + pd.to_timedelta(total_dias * fracao, unit='D').to_numpy()
+        for fracao in (0.25, 0.50, 0.75)
+    ])
+    return CalendarioIndexado(calendario['semestre'].tolist(), inicios, fins, quartis)
+
+
+@lru_cache(maxsize=8)
+def _calendario_do_arquivo(caminho: str) -> CalendarioIndexado:
+    return indexar_calendario(caminho)
+
+
+@cronometrado('classificacao')
+def classificar_mensagens(df, calendario=None):
+    """
+    Adiciona ao DataFrame as colunas Semestre e Periodo_Semestre (quartil do semestre em que a
+    mensagem foi enviada, ou "Férias" fora dos semestres).
+
+    Args:
+        df: DataFrame retornado por process_whatsapp_chat (ou com a coluna Dia do esquema antigo)
+        calendario: caminho de CSV, DataFrame, lista de tuplas ou CalendarioIndexado.
+            Se omitido, usa o calendário padrão.
+    """
+    if calendario is None or isinstance(calendario, (str, os.PathLike)):
+        calendario = _calendario_do_arquivo(os.fspath(calendario or CALENDARIO_PADRAO))
+    elif not isinstance(calendario, CalendarioIndexado):
+        calendario = indexar_calendario(calendario)
+
+    # A classificação é por dia, como no calendário
+    dias = extrair_dia(df) if 'Data_Hora' in df.columns else pd.to_datetime(df['Dia'])
+    dias = dias.to_numpy(dtype='datetime64[ns]')
+    n_semestres = len(calendario.semestres)
+
+    # Semestre com o maior início <= data; vale se a data também for <= fim
+    indice = np.searchsorted(calendario.inicios, dias, side='right') - 1
+    candidato = np.clip(indice, 0, None)
+    no_semestre = (indice >= 0) & (dias <= calendario.fins[candidato])
+
+    cortes = calendario.quartis[:, candidato]
+    periodo = np.select([dias <= cortes[0], dias <= cortes[1], dias <= cortes[2]], [0, 1, 2], default=3)
+
+    df['Semestre'] = pd.Categorical.from_codes(
+        np.where(no_semestre, candidato, n_semestres),
+        categories=calendario.semestres + [FERIAS]
+    )
+    df['Periodo_Semestre'] = pd.Categorical.from_codes(
+        np.where(no_semestre, periodo, len(PERIODOS_SEMESTRE)),
+        categories=PERIODOS_SEMESTRE + [FERIAS]
+    )
     
     return df
 
-import pandas as pd
-import nltk
-from textblob import TextBlob
-from typing import Tuple
 
-def analyze_sentiments(df: pd.DataFrame, text_column: str = 'Mensagem') -> Tuple[pd.DataFrame, dict]:
+# Número padrão de textos limpos com polaridade guardada no cache LRU
+TAMANHO_CACHE_SENTIMENTO = 100_000
+
+# Abaixo deste número de textos únicos o modo paralelo cai para o serial, pois iniciar o
+# pool de processos custa mais do que pontuar os textos
+LIMIAR_PARALELO = 20_000
+TAMANHO_MINIMO_LOTE = 1_000
+
+# Limiares de polaridade para classificar o sentimento
+LIMIAR_POSITIVO = 0.1
+LIMIAR_NEGATIVO = -0.1
+
+# Textos únicos processados entre dois avisos de progresso (e verificações de cancelamento)
+TAMANHO_BLOCO_PROGRESSO = 5_000
+
+# Recebe a fração concluída (0 a 1) e o nome da etapa em andamento
+Progresso = Callable[[float, str], None]
+
+
+class AnaliseCancelada(Exception):
+    """A análise foi interrompida porque o evento de cancelamento foi sinalizado."""
+
+
+def _verificar_cancelamento(cancelamento: Optional[threading.Event]):
+    if cancelamento is not None and cancelamento.is_set():
+        raise AnaliseCancelada()
+
+
+@lru_cache(maxsize=None)
+def _tokenizador():
+    """Tokenizador compilado uma única vez; o nltk só é importado no primeiro uso."""
+    import nltk
+    return nltk.RegexpTokenizer(r'\w+')
+
+
+def clean_text(text) -> str:
+    """Converte para minúsculas, tokeniza e remove as stopwords de um texto."""
+    if not isinstance(text, str):
+        return ""
+    tokens = _tokenizador().tokenize(text.lower())
+    return " ".join(word for word in tokens if word not in stopwords_pt)
+
+
+def get_sentiment(text: str) -> float:
+    """Polaridade do TextBlob para um texto limpo."""
+    from textblob import TextBlob  # importado no primeiro uso (e em cada processo do pool)
+    return TextBlob(text).sentiment.polarity
+
+
+_polaridade_cacheada = lru_cache(maxsize=TAMANHO_CACHE_SENTIMENTO)(get_sentiment)
+
+
+def configurar_cache_sentimento(tamanho: int):
+    """Recria o cache LRU de polaridade por texto com o tamanho informado (descarta o atual)."""
+    global _polaridade_cacheada
+    _polaridade_cacheada = lru_cache(maxsize=tamanho)(get_sentiment)
+
+
+def classify_sentiment(polaridade) -> np.ndarray:
+    """Classifica um vetor de polaridades em positivo, negativo ou neutro."""
+    polaridade = np.asarray(polaridade, dtype=float)
+    return np.select(
+        [polaridade > LIMIAR_POSITIVO, polaridade < LIMIAR_NEGATIVO],
+        ['positivo', 'negativo'],
+        default='neutro'
+    ).astype(object)
+
+
+def _pontuar_lote(textos) -> list:
+    """Pontua um lote de textos em um processo do pool."""
+    return [get_sentiment(texto) for texto in textos]
+
+
+def _tamanho_lote(n_textos: int, workers: int) -> int:
+    """Cerca de 4 lotes por processo para equilibrar a carga, sem lotes pequenos demais."""
+    return max(TAMANHO_MINIMO_LOTE, math.ceil(n_textos / (workers * 4)))
+
+
+def _limpar_unicos(textos, progresso: Optional[Progresso] = None,
+                   cancelamento: Optional[threading.Event] = None) -> list:
+    """clean_text de cada texto único, em blocos para avisar o progresso e permitir cancelar."""
+    limpos = []
+    for inicio in range(0, len(textos), TAMANHO_BLOCO_PROGRESSO):
+        _verificar_cancelamento(cancelamento)
+        limpos.extend(clean_text(texto) for texto in textos[inicio:inicio + TAMANHO_BLOCO_PROGRESSO])
+        if progresso is not None:
+            progresso(len(limpos) / len(textos), 'limpeza')
+    return limpos
+
+
+def _pontuar_unicos(textos, workers: int = 1, progresso: Optional[Progresso] = None,
+                    cancelamento: Optional[threading.Event] = None) -> np.ndarray:
+    """
+    Polaridade de cada texto limpo único. No modo serial consulta o cache LRU; com workers > 1
+    e textos suficientes, divide os textos em lotes entre processos e junta na ordem original.
+    O progresso é avisado e o cancelamento verificado a cada bloco (ou lote) pontuado.
+    """
+    polaridades = np.empty(len(textos), dtype=float)
+    if workers <= 1 or len(textos) < LIMIAR_PARALELO:
+        for inicio in range(0, len(textos), TAMANHO_BLOCO_PROGRESSO):
+            _verificar_cancelamento(cancelamento)
+            fim = min(inicio + TAMANHO_BLOCO_PROGRESSO, len(textos))
+            polaridades[inicio:fim] = [_polaridade_cacheada(texto) for texto in textos[inicio:fim]]
+            if progresso is not None:
+                progresso(fim / len(textos), 'sentimentos')
+        return polaridades
+
+    tamanho = _tamanho_lote(len(textos), workers)
+    lotes = [textos[i:i + tamanho] for i in range(0, len(textos), tamanho)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map preserva a ordem dos lotes, então o resultado é idêntico ao serial
+        fim = 0
+        for resultado in executor.map(_pontuar_lote, lotes):
+            if cancelamento is not None and cancelamento.is_set():
+                executor.shutdown(cancel_futures=True)
+                raise AnaliseCancelada()
+            polaridades[fim:fim + len(resultado)] = resultado
+            fim += len(resultado)
+            if progresso is not None:
+                progresso(fim / len(textos), 'sentimentos')
+    return polaridades
+
+
+@cronometrado('sentimentos')
+def analyze_sentiments(df: pd.DataFrame, text_column: str = 'Mensagem',
+                       cache_size: Optional[int] = None, workers: int = 1,
+                       progresso: Optional[Progresso] = None,
+                       cancelamento: Optional[threading.Event] = None) -> Tuple[pd.DataFrame, dict]:
     """
     Realiza análise de sentimentos em um DataFrame com textos de conversas do WhatsApp.
+
+    Cada texto distinto é limpo uma única vez e cada texto limpo distinto é pontuado uma
+    única vez; as polaridades ficam em um cache LRU compartilhado entre chamadas.
     
     Args:
         df: DataFrame contendo os dados do chat
         text_column: Nome da coluna que contém os textos a serem analisados
+        cache_size: Tamanho do cache LRU de polaridade. Se omitido, mantém o cache atual.
+        workers: Número de processos para pontuar os textos. Com menos de LIMIAR_PARALELO
+            textos únicos a pontuação é sempre serial.
+        progresso: Chamada com a fração concluída e a etapa ('limpeza' ou 'sentimentos') a
+            cada bloco de TAMANHO_BLOCO_PROGRESSO textos únicos
+        cancelamento: Evento verificado a cada bloco; se sinalizado, a análise é interrompida
         
     Returns:
         Tuple contendo:
         - DataFrame original com colunas adicionais de análise de sentimentos
         - Dicionário com estatísticas resumidas dos sentimentos
+
+    Raises:
+        AnaliseCancelada: se o evento de cancelamento for sinalizado durante a análise
     """
     
     # Verificar se o DataFrame contém a coluna especificada
     if text_column not in df.columns:
         raise ValueError(f"A coluna '{text_column}' não existe no DataFrame")
+
+    if cache_size is not None and cache_size != _polaridade_cacheada.cache_info().maxsize:
+        configurar_cache_sentimento(cache_size)
     
     # Criar cópia para não modificar o original
     df_analysis = df.copy()
     
-    # Função para limpeza do texto
-    def clean_text(text):
-        if not isinstance(text, str):
-            return ""
-        text = text.lower()
-        text = nltk.RegexpTokenizer(r'\w+').tokenize(text)
-        text = " ".join(word for word in text if word not in stopwords_pt)
-        return text
-    
-    # Função para análise de sentimento
-    def get_sentiment(text):
-        analysis = TextBlob(text)
-        return analysis.sentiment.polarity
-    
-    # Função para classificar o sentimento
-    def classify_sentiment(polarity):
-        if polarity > 0.1:  # Limiar ajustável
-            return 'positivo'
-        elif polarity < -0.1:  # Limiar ajustável
-            return 'negativo'
-        else:
-            return 'neutro'
-    
-    # Aplicar as transformações
-    df_analysis['texto_limpo'] = df_analysis[text_column].apply(clean_text)
-    df_analysis['polaridade'] = df_analysis['texto_limpo'].apply(get_sentiment)
-    df_analysis['sentimento'] = df_analysis['polaridade'].apply(classify_sentiment)
+    # Limpeza: um clean_text por mensagem distinta. Valores ausentes recebem o código -1,
+    # que aponta para o "" acrescentado ao fim da lista de textos limpos.
+    codigos, unicos = pd.factorize(df_analysis[text_column])
+    limpos = np.array(_limpar_unicos(unicos, progresso, cancelamento) + [""], dtype=object)
+    texto_limpo = limpos[codigos]
+
+    # Polaridade: uma consulta por texto limpo distinto
+    codigos_limpos, limpos_unicos = pd.factorize(texto_limpo)
+    polaridade = _pontuar_unicos(limpos_unicos, workers, progresso, cancelamento)[codigos_limpos]
+
+    df_analysis['texto_limpo'] = texto_limpo
+    df_analysis['polaridade'] = polaridade
+    df_analysis['sentimento'] = classify_sentiment(polaridade)
     
-    # Calcular estatísticas resumidas
+    return df_analysis, estatisticas_sentimento(df_analysis)
+
+
+def estatisticas_sentimento(df_analysis: pd.DataFrame) -> dict:
+    """Estatísticas resumidas de um DataFrame com as colunas polaridade e sentimento."""
+    # Conversa vazia (ou arquivo que não é uma exportação do WhatsApp): tudo zerado
+    if len(df_analysis) == 0:
+        return {
+            'total_mensagens': 0,
+            'polaridade_media': 0.0,
+            'percent_positivo': 0.0,
+            'percent_negativo': 0.0,
+            'percent_neutro': 0.0,
+            'contagem_sentimentos': {}
+        }
     sentiment_counts = df_analysis['sentimento'].value_counts().to_dict()
-    stats = {
+    return {
         'total_mensagens': len(df_analysis),
         'polaridade_media': df_analysis['polaridade'].mean(),
         'percent_positivo': (sentiment_counts.get('positivo', 0) / len(df_analysis)) * 100,
@@ -214,5 +369,75 @@ def analyze_sentiments(df: pd.DataFrame, text_column: str = 'Mensagem') -> Tuple
         'percent_neutro': (sentiment_counts.get('neutro', 0) / len(df_analysis)) * 100,
         'contagem_sentimentos': sentiment_counts
     }
-    
-    return df_analysis, stats
+
+
+def indexar_participantes(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, slice]]:
+    """
+    Ordena o DataFrame por participante (mantendo a ordem das mensagens de cada um) e retorna
+    a tabela junto com o intervalo de linhas de cada participante.
+
+    Returns:
+        Tuple contendo:
+        - DataFrame com Telefone categórico, agrupado por participante
+        - Dicionário participante -> slice, para uso com tabela.iloc[fatias[participante]]
+    """
+    tabela = df.assign(Telefone=df['Telefone'].astype('category'))
+    tabela = tabela.sort_values('Telefone', kind='stable', ignore_index=True)
+
+    # Com sort=False a contagem segue a ordem das categorias, que é a ordem da tabela
+    contagens = tabela['Telefone'].value_counts(sort=False)
+    limites = np.concatenate([[0], np.cumsum(contagens.to_numpy())])
+    fatias = {
+        participante: slice(int(inicio), int(fim))
+        for participante, inicio, fim in zip(contagens.index, limites[:-1], limites[1:])
+    }
+    return tabela, fatias
+
+
+def resumo_sentimentos(df: pd.DataFrame) -> pd.DataFrame:
+    """Estatísticas de sentimento de todos os participantes, calculadas com groupby."""
+    contagem = (
+        df.groupby(['Telefone', 'sentimento'], observed=True).size()
+        .unstack(fill_value=0)
+        .reindex(columns=['positivo', 'negativo', 'neutro'], fill_value=0)
+    )
+    total = contagem.sum(axis=1)
+    resumo = pd.DataFrame({
+        'total_mensagens': total,
+        'polaridade_media': df.groupby('Telefone', observed=True)['polaridade'].mean(),
+    })
+    for sentimento in contagem.columns:
+        resumo[f'percent_{sentimento}'] = contagem[sentimento] / total * 100
+    return resumo.sort_values('total_mensagens', ascending=False)
+
+
+@cronometrado('frequencias')
+def frequencias_por_participante(df: pd.DataFrame, text_column: str = 'texto_limpo',
+                                 tamanho_minimo: int = 2) -> pd.Series:
+    """
+    Conta as palavras de cada participante a partir do texto já tokenizado e sem stopwords
+    por analyze_sentiments, em uma única passada com explode/value_counts.
+
+    Args:
+        df: DataFrame com as colunas Telefone e text_column
+        text_column: Coluna com os tokens separados por espaço
+        tamanho_minimo: Palavras mais curtas são ignoradas (como na WordCloud)
+
+    Returns:
+        Series com índice (Telefone, palavra) e a contagem, ordenada da mais frequente
+        para a menos frequente dentro de cada participante
+    """
+    tokens = pd.Series(df[text_column].str.split().to_numpy(), index=df['Telefone'].to_numpy()).explode()
+    tokens = tokens[tokens.str.len() >= tamanho_minimo]
+    contagem = pd.DataFrame({'Telefone': tokens.index, 'palavra': tokens.to_numpy()}).value_counts()
+    return contagem.sort_index(level=0, sort_remaining=False, kind='stable')
+
+
+def frequencias_do_participante(frequencias: pd.Series, participante, limite: Optional[int] = None) -> Dict[str, int]:
+    """Dicionário palavra -> contagem de um participante, com as limite palavras mais frequentes."""
+    if participante not in frequencias.index.get_level_values(0):
+        return {}
+    contagem = frequencias.xs(participante, level=0)
+    if limite is not None:
+        contagem = contagem.head(limite)
+    return contagem.to_dict()
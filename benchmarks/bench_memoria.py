@@ -0,0 +1,49 @@
+"""
+Memória ocupada pelo DataFrame de process_whatsapp_chat, extrapolada para um milhão de
+mensagens: esquema antigo (Dia/Horário/Telefone/Mensagem como object) contra o compacto.
+
+Uso:
+    python benchmarks/bench_memoria.py --mensagens 500000
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auxiliar import para_esquema_antigo, process_whatsapp_chat
+from gerador import escrever_conversa
+
+
+def megabytes_por_milhao(df) -> float:
+    return df.memory_usage(deep=True).sum() / len(df) * 1_000_000 / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mensagens', type=int, default=500_000)
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as tmp:
+        pass
+    try:
+        escrever_conversa(tmp.name, args.mensagens, 'android')
+        compacto = process_whatsapp_chat(tmp.name)
+        sem_arrow = process_whatsapp_chat(tmp.name, arrow_strings=False)
+    finally:
+        os.remove(tmp.name)
+
+    variantes = {
+        'antigo (object)': para_esquema_antigo(compacto),
+        'compacto (object)': sem_arrow,
+        'compacto (arrow)': compacto,
+    }
+    for nome, df in variantes.items():
+        print(f"{nome:18s} {megabytes_por_milhao(df):8.1f} MB por milhão de mensagens")
+        for coluna, tamanho in df.memory_usage(deep=True, index=False).items():
+            print(f"    {coluna:10s} {tamanho / len(df) * 1_000_000 / 2**20:8.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Benchmark do parser de conversas: linhas por segundo em um chat sintético para cada dialeto.
+
+Uso:
+    python benchmarks/bench_parser.py --mensagens 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auxiliar import process_whatsapp_chat
+from gerador import CABECALHOS, escrever_conversa
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mensagens', type=int, default=1_000_000)
+    parser.add_argument('--dialetos', nargs='+', default=list(CABECALHOS))
+    args = parser.parse_args()
+
+    for dialeto in args.dialetos:
+        with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as tmp:
+            pass
+        try:
+            n_linhas = escrever_conversa(tmp.name, args.mensagens, dialeto)
+            inicio = time.perf_counter()
+            df = process_whatsapp_chat(tmp.name)
+            duracao = time.perf_counter() - inicio
+        finally:
+            os.remove(tmp.name)
+        print(f"{dialeto:12s} {n_linhas / duracao:>12,.0f} linhas/s  "
+              f"({len(df):,} mensagens em {duracao:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark de cada etapa da análise (leitura, filtro, classificação por semestre, sentimentos,
+frequências e nuvem de palavras) em conversas sintéticas de vários tamanhos, com os
+resultados gravados em JSON para comparar versões.
+
+Uso:
+    python benchmarks/bench_pipeline.py --tamanhos 10000 100000 1000000 --saida resultados.json
+    python benchmarks/bench_pipeline.py --tamanhos 10000 --comparar resultados.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from wordcloud import WordCloud
+
+from auxiliar import (
+    analyze_sentiments, classificar_mensagens, configurar_cache_sentimento, filtrar_mensagens,
+    frequencias_do_participante, frequencias_por_participante, process_whatsapp_chat,
+    TAMANHO_CACHE_SENTIMENTO
+)
+from gerador import escrever_conversa
+
+ETAPAS = ['leitura', 'filtro', 'classificacao', 'sentimentos', 'frequencias', 'nuvem']
+
+
+def _versao() -> str:
+    """Commit atual do repositório, se disponível."""
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'desconhecida'
+
+
+def medir_etapas(caminho: str) -> dict:
+    """Executa o pipeline uma vez e retorna a duração em segundos e as linhas de cada etapa."""
+    resultados = {}
+
+    def medir(etapa, funcao, *args):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        resultados[etapa] = time.perf_counter() - inicio
+        return resultado
+
+    df = medir('leitura', lambda: process_whatsapp_chat(caminho, filtrar=False))
+    df = medir('filtro', lambda: filtrar_mensagens(df).reset_index(drop=True))
+    df = medir('classificacao', classificar_mensagens, df)
+    # Cache vazio para medir o custo de uma primeira análise
+    configurar_cache_sentimento(TAMANHO_CACHE_SENTIMENTO)
+    df, _ = medir('sentimentos', analyze_sentiments, df)
+    frequencias = medir('frequencias', frequencias_por_participante, df)
+    mais_ativo = df['Telefone'].value_counts().index[0]
+    palavras = frequencias_do_participante(frequencias, mais_ativo, limite=200)
+    medir('nuvem', lambda: WordCloud(
+        width=800, height=400, background_color='white', max_words=200
+    ).generate_from_frequencies(palavras).to_image())
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--dialetos', nargs='+', default=['android', 'ios'])
+    parser.add_argument('--repeticoes', type=int, default=3, help="Mantém o menor tempo de cada etapa")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--saida', help="Arquivo JSON com os resultados")
+    parser.add_argument('--comparar', help="JSON de uma execução anterior para comparar")
+    parser.add_argument('--tolerancia', type=float, default=1.2,
+                        help="Razão de tempo acima da qual uma etapa é considerada regressão")
+    args = parser.parse_args()
+
+    resultados = []
+    for tamanho in args.tamanhos:
+        for dialeto in args.dialetos:
+            with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as tmp:
+                pass
+            try:
+                escrever_conversa(tmp.name, tamanho, dialeto, seed=args.seed)
+                medicoes = [medir_etapas(tmp.name) for _ in range(args.repeticoes)]
+            finally:
+                os.remove(tmp.name)
+            for etapa in ETAPAS:
+                segundos = min(medicao[etapa] for medicao in medicoes)
+                resultados.append({
+                    'tamanho': tamanho, 'dialeto': dialeto, 'etapa': etapa, 'segundos': segundos,
+                    'mensagens_por_segundo': tamanho / segundos if segundos else None,
+                })
+                print(f"{tamanho:>9,} {dialeto:8s} {etapa:14s} {segundos:9.3f}s "
+                      f"{tamanho / segundos:>14,.0f} mensagens/s")
+
+    relatorio = {
+        'versao': _versao(),
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'resultados': resultados,
+    }
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            anterior = json.load(arquivo)
+        referencia = {(r['tamanho'], r['dialeto'], r['etapa']): r['segundos'] for r in anterior['resultados']}
+        regressoes = 0
+        print(f"\nComparação com {anterior['versao']} ({anterior['data']}):")
+        for r in resultados:
+            chave = (r['tamanho'], r['dialeto'], r['etapa'])
+            if chave not in referencia:
+                continue
+            razao = r['segundos'] / referencia[chave]
+            marca = ' REGRESSÃO' if razao > args.tolerancia else ''
+            regressoes += bool(marca)
+            print(f"{r['tamanho']:>9,} {r['dialeto']:8s} {r['etapa']:14s} {razao:6.2f}x{marca}")
+        sys.exit(1 if regressoes else 0)
+
+
+if __name__ == '__main__':
+    main()
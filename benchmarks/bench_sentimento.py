@@ -0,0 +1,91 @@
+"""
+Benchmark da análise de sentimentos: mensagens por segundo antes (apply por mensagem) e depois
+(deduplicação + cache LRU, serial e paralelo) em um chat sintético com mensagens curtas repetidas.
+
+Uso:
+    python benchmarks/bench_sentimento.py --mensagens 200000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import nltk
+import pandas as pd
+from textblob import TextBlob
+
+from auxiliar import analyze_sentiments, configurar_cache_sentimento, stopwords_pt
+
+REPETIDAS = ["kkk", "bom dia", "ok", "valeu", "boa noite pessoal", "kkkkkk", "obrigado!"]
+PALAVRAS = ("aula prova professor trabalho ótimo excelente ruim péssimo difícil fácil "
+            "legal chato feliz triste entrega nota matéria dúvida").split()
+
+
+def gerar_mensagens(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = random.Random(seed)
+    mensagens = [
+        rng.choice(REPETIDAS) if rng.random() < 0.5
+        else " ".join(rng.choices(PALAVRAS, k=rng.randint(3, 15)))
+        for _ in range(n)
+    ]
+    return pd.DataFrame({'Mensagem': mensagens})
+
+
+def analyze_sentiments_antes(df: pd.DataFrame) -> pd.DataFrame:
+    """Implementação anterior: tokenizador e TextBlob criados por mensagem via apply."""
+    def clean_text(text):
+        if not isinstance(text, str):
+            return ""
+        text = nltk.RegexpTokenizer(r'\w+').tokenize(text.lower())
+        return " ".join(word for word in text if word not in stopwords_pt)
+
+    def classify_sentiment(polarity):
+        if polarity > 0.1:
+            return 'positivo'
+        elif polarity < -0.1:
+            return 'negativo'
+        return 'neutro'
+
+    df = df.copy()
+    df['texto_limpo'] = df['Mensagem'].apply(clean_text)
+    df['polaridade'] = df['texto_limpo'].apply(lambda t: TextBlob(t).sentiment.polarity)
+    df['sentimento'] = df['polaridade'].apply(classify_sentiment)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mensagens', type=int, default=200_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    df = gerar_mensagens(args.mensagens)
+
+    inicio = time.perf_counter()
+    antes = analyze_sentiments_antes(df)
+    duracao_antes = time.perf_counter() - inicio
+
+    # Cache vazio para medir o custo de uma primeira análise
+    configurar_cache_sentimento(100_000)
+    inicio = time.perf_counter()
+    depois, _ = analyze_sentiments(df)
+    duracao_depois = time.perf_counter() - inicio
+
+    configurar_cache_sentimento(100_000)
+    inicio = time.perf_counter()
+    paralelo, _ = analyze_sentiments(df, workers=args.workers)
+    duracao_paralelo = time.perf_counter() - inicio
+
+    pd.testing.assert_frame_equal(antes, depois, check_dtype=False)
+    pd.testing.assert_frame_equal(depois, paralelo)
+    print(f"antes     {args.mensagens / duracao_antes:>12,.0f} mensagens/s ({duracao_antes:.2f}s)")
+    print(f"depois    {args.mensagens / duracao_depois:>12,.0f} mensagens/s ({duracao_depois:.2f}s)")
+    print(f"paralelo  {args.mensagens / duracao_paralelo:>12,.0f} mensagens/s "
+          f"({duracao_paralelo:.2f}s, {args.workers} workers)")
+
+
+if __name__ == '__main__':
+    main()
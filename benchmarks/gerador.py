@@ -0,0 +1,140 @@
+"""
+Gerador determinístico de conversas sintéticas no formato exportado pelo WhatsApp, para
+benchmarks sem depender de conversas reais.
+
+Uso:
+    python benchmarks/gerador.py conversa.txt --mensagens 100000 --dialeto ios --seed 1
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional
+
+# Formato do cabeçalho de cada dialeto suportado pelo parser
+CABECALHOS = {
+    'android': lambda t: t.strftime('%d/%m/%Y %H:%M - '),
+    'android_aa': lambda t: t.strftime('%d/%m/%y %H:%M - '),
+    'ios': lambda t: t.strftime('[%d/%m/%Y, %H:%M:%S] '),
+    'ios_aa': lambda t: t.strftime('[%d/%m/%y, %H:%M:%S] '),
+    'android_12h': lambda t: f"{t.month}/{t.day}/{t:%y}, {t:%I}:{t:%M} {t:%p} - ".lstrip('0'),
+    'ios_12h': lambda t: f"[{t:%d/%m/%Y}, {t.hour % 12 or 12}:{t:%M:%S} {t:%p}] ",
+}
+
+# Mensagens que o filtro de process_whatsapp_chat descarta
+RUIDO = {
+    'midia': ['<Mídia oculta>'],
+    'apagada': ['Mensagem apagada'],
+    'link': ['https://chat.whatsapp.com/AbCdEfGh123', 'olha isso https://exemplo.com.br/noticia'],
+}
+
+# No iOS, mídias e mensagens apagadas vêm com U+200E antes do cabeçalho e antes do texto
+RUIDO_IOS = {
+    'midia': ['\u200eimage omitted', '\u200esticker omitted', '\u200e<attached: 00000012-PHOTO-2022-01-01-08-00-00.jpg>'],
+    'apagada': ['\u200eThis message was deleted', '\u200eYou deleted this message'],
+    'link': RUIDO['link'],
+}
+
+PALAVRAS = (
+    "bom dia boa tarde noite pessoal alguém sabe data prova amanhã hoje tem aula professor "
+    "professora trabalho entrega nota matéria dúvida lista exercício grupo reunião sala "
+    "biblioteca semestre férias ótimo excelente legal difícil fácil chato cansado feliz "
+    "triste obrigado obrigada valeu beleza combinado certo verdade acho vamos fazer ver "
+    "mandar link arquivo resumo slide capítulo questão resposta gabarito calma kkk kkkkk "
+    "good great nice bad top show demais"
+).split()
+
+REPETIDAS = ["kkk", "bom dia", "ok", "valeu", "boa noite pessoal", "kkkkkk", "obrigado!", "sim", "👍"]
+
+
+def _participantes(n: int, rng: random.Random) -> List[str]:
+    """Mistura nomes de contatos e números de telefone, como nas exportações reais."""
+    nomes = []
+    for i in range(n):
+        if i % 3 == 2:
+            nomes.append(f"+55 {rng.randint(11, 99)} 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}")
+        else:
+            nomes.append(f"Participante {i + 1}")
+    return nomes
+
+
+def gerar_linhas(n_mensagens: int, dialeto: str = 'android', participantes: int = 30,
+                 inicio: datetime = datetime(2022, 1, 1, 8, 0, 0), dias: int = 730,
+                 proporcao_multilinha: float = 0.1, proporcao_ruido: float = 0.05,
+                 seed: int = 0) -> Iterator[str]:
+    """
+    Gera as linhas de uma conversa sintética.
+
+    Args:
+        n_mensagens: Número de mensagens (cabeçalhos) geradas
+        dialeto: Chave de CABECALHOS
+        participantes: Número de participantes; a atividade segue uma distribuição de Zipf
+        inicio: Data e hora da primeira mensagem
+        dias: Período coberto pela conversa
+        proporcao_multilinha: Fração das mensagens com linhas de continuação
+        proporcao_ruido: Fração das mensagens de mídia, apagadas ou com links
+        seed: Semente do gerador aleatório
+
+    Returns:
+        Iterador com as linhas, sem quebra de linha no final
+    """
+    rng = random.Random(seed)
+    cabecalho = CABECALHOS[dialeto]
+    nomes = _participantes(participantes, rng)
+    pesos = [1 / (posicao + 1) for posicao in range(participantes)]
+    ruido = RUIDO_IOS if dialeto.startswith('ios') else RUIDO
+    tipos_ruido = list(ruido)
+    intervalo_medio = dias * 86_400 / max(n_mensagens, 1)
+    instante = inicio
+
+    for _ in range(n_mensagens):
+        instante += timedelta(seconds=int(rng.expovariate(1 / intervalo_medio)) + 1)
+        nome = rng.choices(nomes, weights=pesos)[0]
+        sorteio = rng.random()
+        if sorteio < proporcao_ruido:
+            texto = rng.choice(ruido[rng.choice(tipos_ruido)])
+        elif sorteio < 0.4:
+            texto = rng.choice(REPETIDAS)
+        else:
+            texto = " ".join(rng.choices(PALAVRAS, k=rng.randint(2, 20)))
+        marca = '\u200e' if texto.startswith('\u200e') else ''
+        yield f"{marca}{cabecalho(instante)}{nome}: {texto}"
+
+        if rng.random() < proporcao_multilinha:
+            for _ in range(rng.randint(1, 3)):
+                yield " ".join(rng.choices(PALAVRAS, k=rng.randint(1, 12)))
+
+
+def escrever_conversa(caminho: str, n_mensagens: int, dialeto: str = 'android',
+                      seed: int = 0, **kwargs) -> int:
+    """Grava a conversa em um arquivo UTF-8 e retorna o número de linhas escritas."""
+    n_linhas = 0
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        for linha in gerar_linhas(n_mensagens, dialeto, seed=seed, **kwargs):
+            arquivo.write(linha + '\n')
+            n_linhas += 1
+    return n_linhas
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('saida')
+    parser.add_argument('--mensagens', type=int, default=100_000)
+    parser.add_argument('--dialeto', choices=list(CABECALHOS), default='android')
+    parser.add_argument('--participantes', type=int, default=30)
+    parser.add_argument('--inicio', type=datetime.fromisoformat, default=datetime(2022, 1, 1, 8, 0, 0))
+    parser.add_argument('--dias', type=int, default=730)
+    parser.add_argument('--multilinha', type=float, default=0.1)
+    parser.add_argument('--ruido', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    n_linhas = escrever_conversa(
+        args.saida, args.mensagens, args.dialeto, seed=args.seed, participantes=args.participantes,
+        inicio=args.inicio, dias=args.dias, proporcao_multilinha=args.multilinha,
+        proporcao_ruido=args.ruido,
+    )
+    print(f"{args.mensagens:,} mensagens ({n_linhas:,} linhas) gravadas em {args.saida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Relatório de tempo de importação dos módulos carregados pela interface antes do primeiro
+desenho da página (python -X importtime).
+
+O servidor do Streamlit já tem o streamlit importado quando executa o script, então o tempo
+até o primeiro desenho é o das importações de interface.py anteriores ao widget de upload,
+medidas aqui em um interpretador novo depois de importar o streamlit. Para medir outros
+módulos (por exemplo, o parser sozinho), passe-os na linha de comando.
+
+Uso:
+    python benchmarks/importtime.py --saida importtime.json
+    python benchmarks/importtime.py --comparar importtime.json
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# import time:  self [us] | cumulative | imported package
+_LINHA = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)')
+
+
+def importacoes_da_interface(caminho: str = os.path.join(RAIZ, 'interface.py')) -> list:
+    """
+    Módulos importados no nível de módulo de interface.py antes do widget de upload, na ordem
+    do arquivo. O que vem depois do upload não atrasa o primeiro desenho da página.
+    """
+    with open(caminho, encoding='utf-8') as arquivo:
+        arvore = ast.parse(arquivo.read())
+    modulos = []
+    for no in arvore.body:
+        if any(isinstance(filho, ast.Attribute) and filho.attr == 'file_uploader' for filho in ast.walk(no)):
+            break
+        if isinstance(no, ast.Import):
+            modulos.extend(alias.name for alias in no.names)
+        elif isinstance(no, ast.ImportFrom) and no.module:
+            modulos.append(no.module)
+    return list(dict.fromkeys(modulos))
+
+
+def medir(modulos: list, ja_carregados=('streamlit',)) -> list:
+    """
+    Importa os módulos em um interpretador novo com -X importtime.
+
+    Returns:
+        Lista de tuplas (módulo, nível, próprio_us, acumulado_us) das importações feitas
+        depois de ja_carregados, na ordem em que terminaram
+    """
+    codigo = '\n'.join(f'import {modulo}' for modulo in (*ja_carregados, *modulos))
+    saida = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', codigo],
+        capture_output=True, text=True, cwd=RAIZ, check=True,
+    ).stderr
+
+    entradas = []
+    for linha in saida.splitlines():
+        encontrado = _LINHA.match(linha)
+        if encontrado:
+            proprio, acumulado, recuo, modulo = encontrado.groups()
+            entradas.append((modulo, len(recuo) // 2, int(proprio), int(acumulado)))
+
+    # Descarta tudo o que foi importado até o último módulo já carregado terminar
+    ultimo = max(
+        (i for i, entrada in enumerate(entradas) if entrada[1] == 0 and entrada[0] in ja_carregados),
+        default=-1,
+    )
+    return entradas[ultimo + 1:]
+
+
+def resumir(entradas: list) -> dict:
+    """Total, módulos de nível superior e pacotes com maior tempo próprio somado."""
+    por_pacote = defaultdict(int)
+    for modulo, _, proprio, _ in entradas:
+        por_pacote[modulo.split('.')[0]] += proprio
+    return {
+        'total_s': sum(acumulado for _, nivel, _, acumulado in entradas if nivel == 0) / 1e6,
+        'modulos': {modulo: acumulado / 1e6 for modulo, nivel, _, acumulado in entradas if nivel == 0},
+        'pacotes': {
+            pacote: proprio / 1e6
+            for pacote, proprio in sorted(por_pacote.items(), key=lambda item: -item[1])
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modulos', nargs='*', help="Módulos a medir (padrão: importações de interface.py)")
+    parser.add_argument('--repeticoes', type=int, default=5, help="Mantém a execução mais rápida")
+    parser.add_argument('--top', type=int, default=15, help="Número de pacotes listados")
+    parser.add_argument('--saida', help="Arquivo JSON com o relatório")
+    parser.add_argument('--comparar', help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args()
+
+    modulos = args.modulos or [m for m in importacoes_da_interface() if m != 'streamlit']
+    relatorio = min((resumir(medir(modulos)) for _ in range(args.repeticoes)), key=lambda r: r['total_s'])
+
+    print(f"Importações antes do primeiro desenho: {relatorio['total_s']:.3f}s")
+    for modulo, segundos in relatorio['modulos'].items():
+        print(f"  {modulo:24s} {segundos:7.3f}s")
+    print("\nPacotes com maior tempo próprio:")
+    for pacote, segundos in list(relatorio['pacotes'].items())[:args.top]:
+        print(f"  {pacote:24s} {segundos:7.3f}s")
+
+    relatorio.update(data=datetime.now().isoformat(timespec='seconds'), importados=modulos)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            anterior = json.load(arquivo)
+        print(f"\nComparação com {anterior['data']}: {anterior['total_s']:.3f}s -> "
+              f"{relatorio['total_s']:.3f}s ({relatorio['total_s'] / anterior['total_s']:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import io
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+import pandas as pd
+
+
+def estimar_tamanho(valor) -> int:
+    """Estimativa em bytes da memória ocupada por um valor guardado no cache."""
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(deep=True))
+    if isinstance(valor, (tuple, list)):
+        return sys.getsizeof(valor) + sum(estimar_tamanho(item) for item in valor)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(estimar_tamanho(item) for item in valor.values())
+    if isinstance(valor, (bytes, bytearray)):
+        return len(valor)
+    if isinstance(valor, io.BytesIO):
+        return valor.getbuffer().nbytes
+    if hasattr(valor, "getbands"):
+        # Imagem do PIL: largura x altura x canais
+        largura, altura = valor.size
+        return largura * altura * len(valor.getbands())
+    return sys.getsizeof(valor)
+
+
+class CacheLRU:
+    """
+    Cache LRU limitado pela memória estimada dos valores, compartilhado entre as execuções do
+    script do Streamlit. Os valores menos usados recentemente são descartados quando o total
+    ultrapassa max_bytes.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes_usados = 0
+        self.acertos = 0
+        self.falhas = 0
+        self._itens: 'OrderedDict[Hashable, Tuple[Any, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __contains__(self, chave: Hashable) -> bool:
+        return chave in self._itens
+
+    def obter(self, chave: Hashable, calcular: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Retorna (valor, acerto). Em caso de falha, calcula o valor com calcular() e o guarda.
+        O cálculo roda fora do lock para não bloquear as outras sessões.
+        """
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave][0], True
+            self.falhas += 1
+
+        valor = calcular()
+        self.guardar(chave, valor)
+        return valor, False
+
+    def consultar(self, chave: Hashable) -> Any:
+        """Retorna o valor guardado (contando como acerto) ou None, sem calcular nada."""
+        with self._lock:
+            if chave not in self._itens:
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return self._itens[chave][0]
+
+    def guardar(self, chave: Hashable, valor: Any):
+        tamanho = estimar_tamanho(valor)
+        with self._lock:
+            if chave in self._itens:
+                self.bytes_usados -= self._itens.pop(chave)[1]
+            # Um valor maior que o limite inteiro não é guardado
+            if tamanho > self.max_bytes:
+                return
+            self._itens[chave] = (valor, tamanho)
+            self.bytes_usados += tamanho
+            while self.bytes_usados > self.max_bytes:
+                _, (_, tamanho_antigo) = self._itens.popitem(last=False)
+                self.bytes_usados -= tamanho_antigo
+
+    def descartar(self, chave: Hashable):
+        """Remove o valor guardado, se houver (por exemplo, um resultado intermediário já superado)."""
+        with self._lock:
+            if chave in self._itens:
+                self.bytes_usados -= self._itens.pop(chave)[1]
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self.bytes_usados = 0
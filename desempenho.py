@@ -0,0 +1,169 @@
+"""
+Medição de desempenho por etapa: tempo de parede, linhas de entrada e saída e, opcionalmente,
+o pico de memória alocada (tracemalloc).
+
+As medições ficam em uma lista por thread (cada sessão do Streamlit executa em sua própria
+thread) e também são emitidas como JSON no logger "analisewpp.desempenho". Desativada, a
+medição custa apenas a verificação de um atributo.
+
+Ative com a variável de ambiente ANALISEWPP_PERFIL=1 (ANALISEWPP_PERFIL=memoria inclui o
+tracemalloc) ou com ativar(). O tracemalloc é global ao processo: fica ligado enquanto alguma
+thread mede memória e é desligado quando a última deixa de medir.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import List, NamedTuple, Optional
+
+logger = logging.getLogger("analisewpp.desempenho")
+
+_PERFIL_AMBIENTE = os.environ.get("ANALISEWPP_PERFIL", "").lower()
+_ATIVO_AMBIENTE = _PERFIL_AMBIENTE not in ("", "0", "false")
+
+if not logger.handlers:
+    # Uma linha JSON por medição no stderr, seja a medição ativada pelo ambiente ou por ativar()
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+
+class Medicao(NamedTuple):
+    etapa: str
+    segundos: float
+    linhas_entrada: Optional[int]
+    linhas_saida: Optional[int]
+    memoria_pico_bytes: Optional[int]
+
+
+# Threads que medem memória; o tracemalloc iniciado aqui é parado quando não resta nenhuma
+_threads_memoria = set()
+_trava_memoria = threading.Lock()
+_tracemalloc_proprio = False
+
+
+def _atualizar_tracemalloc(memoria: bool):
+    """Registra se a thread atual mede memória e liga ou desliga o tracemalloc conforme o caso."""
+    global _tracemalloc_proprio
+    with _trava_memoria:
+        if memoria:
+            _threads_memoria.add(threading.current_thread())
+        else:
+            _threads_memoria.discard(threading.current_thread())
+        # Threads encerradas sem desligar a medição (por exemplo, sessões fechadas) não contam
+        _threads_memoria.difference_update([t for t in _threads_memoria if not t.is_alive()])
+
+        if _threads_memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_proprio = True
+        elif not _threads_memoria and _tracemalloc_proprio:
+            # Só para o tracemalloc que este módulo iniciou (não o de python -X tracemalloc)
+            tracemalloc.stop()
+            _tracemalloc_proprio = False
+
+
+class _Estado(threading.local):
+    def __init__(self):
+        self.ativo = _ATIVO_AMBIENTE
+        self.memoria = _PERFIL_AMBIENTE == "memoria"
+        self.medicoes: List[Medicao] = []
+        if self.memoria:
+            _atualizar_tracemalloc(True)
+
+
+_estado = _Estado()
+
+
+def ativar(ativo: bool = True, memoria: bool = False):
+    """Liga ou desliga a medição (e o tracemalloc) na thread atual."""
+    _estado.ativo = ativo
+    _estado.memoria = ativo and memoria
+    _atualizar_tracemalloc(_estado.memoria)
+
+
+def ativo() -> bool:
+    return _estado.ativo
+
+
+def memoria() -> bool:
+    """Se a thread atual mede também o pico de memória."""
+    return _estado.memoria
+
+
+def medicoes() -> List[Medicao]:
+    """Medições registradas na thread atual desde a última chamada a limpar()."""
+    return list(_estado.medicoes)
+
+
+def limpar():
+    _estado.medicoes = []
+
+
+def registrar(medicoes: List[Medicao]):
+    """Acrescenta à thread atual medições feitas em outra thread (por exemplo, em segundo plano)."""
+    _estado.medicoes.extend(medicoes)
+
+
+def contar_linhas(valor) -> Optional[int]:
+    """Número de linhas de um DataFrame/Series (ou do primeiro item de uma tupla), se houver."""
+    if type(valor) is tuple and valor:
+        valor = valor[0]
+    if isinstance(getattr(valor, "shape", None), tuple):
+        return len(valor)
+    return None
+
+
+@contextmanager
+def medir(etapa: str, linhas_entrada: Optional[int] = None):
+    """
+    Mede o bloco como uma etapa. O dicionário retornado aceita a chave 'linhas_saida'.
+
+    Com memória ativa, o pico é medido a partir do início do bloco; etapas aninhadas
+    reiniciam o pico do tracemalloc, então o pico da etapa externa passa a considerar
+    apenas o trecho após a última etapa interna.
+    """
+    contexto = {}
+    if not _estado.ativo:
+        yield contexto
+        return
+
+    memoria = _estado.memoria and tracemalloc.is_tracing()
+    if memoria:
+        memoria_inicial = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    inicio = time.perf_counter()
+    try:
+        yield contexto
+    finally:
+        medicao = Medicao(
+            etapa=etapa,
+            segundos=time.perf_counter() - inicio,
+            linhas_entrada=linhas_entrada,
+            linhas_saida=contexto.get("linhas_saida"),
+            memoria_pico_bytes=tracemalloc.get_traced_memory()[1] - memoria_inicial if memoria else None,
+        )
+        _estado.medicoes.append(medicao)
+        logger.info(json.dumps(medicao._asdict()))
+
+
+def cronometrado(etapa: str):
+    """
+    Decorador que mede cada chamada da função como uma etapa. As linhas de entrada vêm do
+    primeiro argumento e as de saída do retorno, quando forem DataFrames.
+    """
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            if not _estado.ativo:
+                return funcao(*args, **kwargs)
+            with medir(etapa, contar_linhas(args[0]) if args else None) as contexto:
+                resultado = funcao(*args, **kwargs)
+                contexto["linhas_saida"] = contar_linhas(resultado)
+            return resultado
+        return envoltorio
+    return decorador
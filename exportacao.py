@@ -0,0 +1,132 @@
+import io
+import re
+import zipfile
+from typing import Dict, Iterable, NamedTuple, Tuple
+
+import pandas as pd
+
+# Linhas convertidas por vez ao escrever o XLSX
+LINHAS_POR_LOTE = 10_000
+
+# Limite de linhas de uma planilha do Excel, descontando o cabeçalho
+LIMITE_LINHAS_XLSX = 1_048_575
+
+
+class Formato(NamedTuple):
+    rotulo: str
+    extensao: str
+    mime: str
+
+
+FORMATOS = {
+    "xlsx": Formato("Excel (XLSX)", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": Formato("CSV", "csv", "text/csv"),
+    "parquet": Formato("Parquet", "parquet", "application/vnd.apache.parquet"),
+}
+
+
+def _nome_aba(nome: str, usados: set) -> str:
+    """Nome de planilha válido no Excel (até 31 caracteres, sem []:*?/\\) e único no arquivo."""
+    base = re.sub(r"[\[\]:*?/\\]", "_", str(nome)).strip("'")[:31] or "Dados"
+    candidato, sufixo = base, 2
+    while candidato.lower() in usados:
+        marca = f"_{sufixo}"
+        candidato, sufixo = base[:31 - len(marca)] + marca, sufixo + 1
+    usados.add(candidato.lower())
+    return candidato
+
+
+def _nome_arquivo(nome: str) -> str:
+    return re.sub(r"[^\w\-+ .]", "_", str(nome)).strip() or "participante"
+
+
+def _linhas_xlsx(df: pd.DataFrame):
+    """Gera as linhas do DataFrame como tuplas de valores Python, convertendo em lotes."""
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    for inicio in range(0, len(df), LINHAS_POR_LOTE):
+        lote = df.iloc[inicio:inicio + LINHAS_POR_LOTE].astype(object)
+        lote = lote.where(lote.notna(), None)
+        for coluna in lote.columns:
+            if pd.api.types.is_string_dtype(df[coluna]) or isinstance(df[coluna].dtype, pd.CategoricalDtype):
+                # Caracteres de controle não são aceitos pelo formato XLSX
+                lote[coluna] = lote[coluna].map(
+                    lambda valor: ILLEGAL_CHARACTERS_RE.sub("", valor) if isinstance(valor, str) else valor
+                )
+        yield from lote.itertuples(index=False, name=None)
+
+
+def exportar_xlsx(abas: Iterable[Tuple[str, pd.DataFrame]], destino):
+    """
+    Escreve cada (nome, DataFrame) em uma planilha usando o modo write-only do openpyxl, que
+    grava as linhas conforme são adicionadas em vez de manter todas as células em memória.
+    DataFrames maiores que o limite do Excel continuam em planilhas numeradas.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    usados = set()
+    for nome, df in abas:
+        for inicio in range(0, max(len(df), 1), LIMITE_LINHAS_XLSX):
+            planilha = workbook.create_sheet(_nome_aba(nome, usados))
+            planilha.append([str(coluna) for coluna in df.columns])
+            for linha in _linhas_xlsx(df.iloc[inicio:inicio + LIMITE_LINHAS_XLSX]):
+                planilha.append(linha)
+    if not workbook.worksheets:
+        workbook.create_sheet("Dados")
+    workbook.save(destino)
+
+
+def exportar(df: pd.DataFrame, formato: str, destino):
+    """Escreve um DataFrame no destino (arquivo binário) no formato indicado."""
+    if formato == "xlsx":
+        exportar_xlsx([("Dados", df)], destino)
+    elif formato == "csv":
+        # utf-8-sig para o Excel reconhecer a acentuação
+        df.to_csv(destino, index=False, encoding="utf-8-sig")
+    elif formato == "parquet":
+        df.to_parquet(destino, index=False)
+    else:
+        raise ValueError(f"Formato de exportação desconhecido: {formato}")
+
+
+def exportar_participantes(tabela: pd.DataFrame, fatias: Dict[str, slice], formato: str, destino):
+    """
+    Exporta todos os participantes em uma única passada pela tabela indexada: em XLSX, uma
+    planilha por participante; em CSV e Parquet, um ZIP com um arquivo por participante.
+    """
+    participantes = ((participante, tabela.iloc[fatia]) for participante, fatia in fatias.items())
+    if formato == "xlsx":
+        exportar_xlsx(participantes, destino)
+        return
+
+    extensao = FORMATOS[formato].extensao
+    usados = set()
+    with zipfile.ZipFile(destino, "w", compression=zipfile.ZIP_DEFLATED) as arquivo_zip:
+        for participante, df in participantes:
+            nome = _nome_arquivo(participante)
+            candidato, sufixo = nome, 2
+            while candidato in usados:
+                candidato, sufixo = f"{nome}_{sufixo}", sufixo + 1
+            usados.add(candidato)
+            with arquivo_zip.open(f"{candidato}.{extensao}", "w") as saida:
+                exportar(df, formato, saida)
+
+
+def gerar_exportacao(df: pd.DataFrame, formato: str) -> io.BytesIO:
+    """
+    Arquivo exportado de um DataFrame, em memória e posicionado no início. O buffer é
+    retornado em vez de uma cópia com getvalue(), para o conteúdo não ficar duas vezes em memória.
+    """
+    buffer = io.BytesIO()
+    exportar(df, formato, buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def gerar_exportacao_participantes(tabela: pd.DataFrame, fatias: Dict[str, slice], formato: str) -> io.BytesIO:
+    """Arquivo exportado com todos os participantes, como em gerar_exportacao."""
+    buffer = io.BytesIO()
+    exportar_participantes(tabela, fatias, formato, buffer)
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,163 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from desempenho import cronometrado
+
+# Uma mensagem é resposta à anterior se for de outro participante e vier até este tempo depois
+JANELA_RESPOSTA = pd.Timedelta(minutes=30)
+
+# Um intervalo maior que este entre duas mensagens inicia uma nova sessão de conversa
+INTERVALO_SESSAO = pd.Timedelta(hours=1)
+
+
+class AnaliseGrupo(NamedTuple):
+    """Interações entre os participantes de uma conversa, calculadas uma vez por conversa."""
+    pares: pd.DataFrame          # índice (respondente, respondido); respostas e latências
+    sessoes: pd.DataFrame        # uma linha por sessão: inicio, fim, duracao_min, mensagens, ...
+    participantes: pd.DataFrame  # índice Telefone; tabela de comparação entre participantes
+
+
+def _ordem_cronologica(df: pd.DataFrame) -> pd.DataFrame:
+    """O DataFrame em ordem de envio (ordenação estável, que mantém a ordem original dos empates)."""
+    if df['Data_Hora'].is_monotonic_increasing:
+        return df
+    return df.iloc[np.argsort(df['Data_Hora'].to_numpy(), kind='stable')]
+
+
+def arestas_resposta(df: pd.DataFrame, janela: pd.Timedelta = JANELA_RESPOSTA) -> pd.DataFrame:
+    """
+    Respostas entre participantes: cada mensagem enviada até `janela` depois da mensagem
+    anterior de outro participante é uma resposta a ele.
+
+    Args:
+        df: DataFrame com Data_Hora e Telefone, como retornado por process_whatsapp_chat
+        janela: Intervalo máximo entre a mensagem e a anterior para contar como resposta
+
+    Returns:
+        DataFrame com respondente, respondido (categóricos), latencia_s e Data_Hora da resposta
+    """
+    df = _ordem_cronologica(df)
+    telefones = df['Telefone'].astype('category')
+    codigos = telefones.cat.codes.to_numpy()
+    tempos = df['Data_Hora'].to_numpy()
+    intervalos = np.diff(tempos)
+
+    resposta = (codigos[1:] != codigos[:-1]) & (intervalos <= janela.to_timedelta64())
+    return pd.DataFrame({
+        'respondente': pd.Categorical.from_codes(codigos[1:][resposta], dtype=telefones.dtype),
+        'respondido': pd.Categorical.from_codes(codigos[:-1][resposta], dtype=telefones.dtype),
+        'latencia_s': intervalos[resposta] / np.timedelta64(1, 's'),
+        'Data_Hora': tempos[1:][resposta],
+    })
+
+
+def latencias_por_par(respostas: pd.DataFrame) -> pd.DataFrame:
+    """Número de respostas e distribuição da latência (quartis e p90) de cada par respondente → respondido."""
+    latencias = respostas.groupby(['respondente', 'respondido'], observed=True)['latencia_s']
+    # Sem respostas o unstack não cria as colunas dos quantis
+    quantis = latencias.quantile([0.25, 0.5, 0.75, 0.9]).unstack().reindex(columns=[0.25, 0.5, 0.75, 0.9])
+    pares = pd.DataFrame({
+        'respostas': latencias.size(),
+        'latencia_p25_s': quantis[0.25],
+        'latencia_mediana_s': quantis[0.5],
+        'latencia_p75_s': quantis[0.75],
+        'latencia_p90_s': quantis[0.9],
+    })
+    return pares.sort_values('respostas', ascending=False)
+
+
+def segmentar_sessoes(df: pd.DataFrame, intervalo: pd.Timedelta = INTERVALO_SESSAO) -> np.ndarray:
+    """Número da sessão (0, 1, ...) de cada mensagem do DataFrame em ordem cronológica."""
+    nova = np.empty(len(df), dtype=bool)
+    nova[:1] = True
+    nova[1:] = np.diff(df['Data_Hora'].to_numpy()) > intervalo.to_timedelta64()
+    return np.cumsum(nova) - 1
+
+
+@cronometrado('grupo')
+def analisar_grupo(df: pd.DataFrame, janela: pd.Timedelta = JANELA_RESPOSTA,
+                   intervalo: pd.Timedelta = INTERVALO_SESSAO) -> AnaliseGrupo:
+    """
+    Respostas entre pares, sessões de conversa e a tabela de comparação dos participantes.
+
+    Args:
+        df: DataFrame com Data_Hora e Telefone, em qualquer ordem
+        janela: Intervalo máximo para uma mensagem contar como resposta à anterior
+        intervalo: Intervalo sem mensagens que separa duas sessões
+
+    Returns:
+        AnaliseGrupo com as tabelas de pares, sessões e participantes
+    """
+    df = _ordem_cronologica(df)
+    telefones = df['Telefone'].astype('category')
+    participantes = pd.Index(telefones.cat.categories, name='Telefone')
+    n_participantes = len(participantes)
+    # Base das chaves combinadas (sessão ou participante × participante); 1 numa conversa vazia
+    base = max(n_participantes, 1)
+    codigos = telefones.cat.codes.to_numpy().astype(np.int64)
+    tempos = df['Data_Hora'].to_numpy()
+
+    respostas = arestas_resposta(df, janela)
+    pares = latencias_por_par(respostas)
+
+    sessao = segmentar_sessoes(df, intervalo)
+    inicios = np.flatnonzero(np.diff(sessao, prepend=-1))
+    fins = np.append(inicios[1:], len(df))[:len(inicios)] - 1
+    # Pares (sessão, participante) distintos, para contar participantes por sessão e vice-versa
+    presencas = np.unique(sessao * base + codigos)
+    sessoes = pd.DataFrame({
+        'inicio': tempos[inicios],
+        'fim': tempos[fins],
+        'duracao_min': (tempos[fins] - tempos[inicios]) / np.timedelta64(1, 'm'),
+        'mensagens': fins - inicios + 1,
+        'participantes': np.bincount(presencas // base, minlength=len(inicios)),
+        'iniciador': pd.Categorical.from_codes(codigos[inicios], dtype=telefones.dtype),
+    })
+
+    respondentes = respostas['respondente'].cat.codes.to_numpy().astype(np.int64)
+    respondidos = respostas['respondido'].cat.codes.to_numpy().astype(np.int64)
+    # Pares (respondente, respondido) distintos, para contar com quantos cada um conversa
+    interlocutores = np.unique(respondentes * base + respondidos) // base
+    comparacao = pd.DataFrame({
+        'mensagens': np.bincount(codigos, minlength=n_participantes),
+        'respostas_enviadas': np.bincount(respondentes, minlength=n_participantes),
+        'respostas_recebidas': np.bincount(respondidos, minlength=n_participantes),
+        'interlocutores': np.bincount(interlocutores, minlength=n_participantes),
+        'sessoes': np.bincount(presencas % base, minlength=n_participantes),
+        'sessoes_iniciadas': np.bincount(codigos[inicios], minlength=n_participantes),
+        # Com observed=False há uma linha por categoria, na ordem de participantes
+        'latencia_mediana_s': respostas.groupby('respondente', observed=False)['latencia_s'].median().to_numpy(),
+    }, index=participantes)
+    comparacao = comparacao[comparacao['mensagens'] > 0]
+    return AnaliseGrupo(pares, sessoes, comparacao.sort_values('mensagens', ascending=False))
+
+
+def arestas_nao_direcionadas(pares: pd.DataFrame, limite: int) -> pd.DataFrame:
+    """
+    Soma as respostas nos dois sentidos de cada par e mantém os `limite` pares com mais
+    respostas, para desenhar a rede de interações.
+
+    Returns:
+        DataFrame com a, b (participantes como texto), respostas, a_para_b e b_para_a
+    """
+    tabela = pares['respostas'].reset_index()
+    respondente = tabela['respondente'].astype(str).to_numpy()
+    respondido = tabela['respondido'].astype(str).to_numpy()
+    ordenado = respondente < respondido
+    tabela = pd.DataFrame({
+        'a': np.where(ordenado, respondente, respondido),
+        'b': np.where(ordenado, respondido, respondente),
+        'a_para_b': np.where(ordenado, tabela['respostas'], 0),
+        'b_para_a': np.where(ordenado, 0, tabela['respostas']),
+    })
+    arestas = tabela.groupby(['a', 'b'], sort=False).sum().reset_index()
+    arestas['respostas'] = arestas['a_para_b'] + arestas['b_para_a']
+    return arestas.nlargest(limite, 'respostas')
+
+
+def layout_circular(n: int) -> np.ndarray:
+    """Posições (x, y) de n nós igualmente espaçados em um círculo de raio 1."""
+    angulos = 2 * np.pi * np.arange(n) / max(n, 1)
+    return np.column_stack([np.cos(angulos), np.sin(angulos)])
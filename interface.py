@@ -1,12 +1,17 @@
+from __future__ import annotations
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from wordcloud import WordCloud
-from io import BytesIO
-import numpy as np
+import io
+import os
+
+import desempenho
+from desempenho import cronometrado, medir
+
+# Limite de memória do cache de resultados compartilhado entre reruns e sessões
+LIMITE_CACHE_MB = int(os.environ.get("ANALISEWPP_CACHE_MB", "1024"))
 
-from auxiliar import process_whatsapp_chat, stopwords_pt, analyze_sentiments
+# Número máximo de palavras na nuvem (mesmo padrão da WordCloud)
+MAX_PALAVRAS_NUVEM = 200
 
 # Configuração da página
 st.set_page_config(page_title="WhatsApp Analyzer", layout="wide")
@@ -44,37 +49,199 @@ def show_export_tutorial():
                 except FileNotFoundError:
                     st.warning(f"Imagem {image} não encontrada")
 
+@st.cache_resource
+def obter_cache() -> CacheLRU:
+    """Cache LRU de resultados, criado uma vez por processo do Streamlit"""
+    return CacheLRU(max_bytes=LIMITE_CACHE_MB * 1024 * 1024)
+
+def obter_hash_upload(uploaded_file) -> str:
+    """Hash do conteúdo do upload, calculado uma vez por arquivo enviado"""
+    hashes = st.session_state.setdefault("hashes_upload", {})
+    file_id = getattr(uploaded_file, "file_id", None) or uploaded_file.name
+    if file_id not in hashes:
+        hashes[file_id] = hash_arquivo(uploaded_file)
+    return hashes[file_id]
+
+@st.cache_resource
+def obter_armazem() -> ArmazemParquet:
+    """Armazenamento em disco das conversas já analisadas"""
+    return ArmazemParquet()
+
+def indexar_conversa(df: pd.DataFrame):
+    """Participantes, interações do grupo e tabela indexada por participante de uma conversa lida"""
+    # Participantes na ordem em que aparecem na conversa
+    participantes = list(df['Telefone'].unique())
+    # Respostas e sessões dependem da ordem das mensagens, perdida ao indexar por participante
+    grupo = analisar_grupo(df)
+    tabela, fatias = indexar_participantes(df)
+    return tabela, fatias, participantes, df.attrs.get('descartes', {}), grupo
+
+def preparar_leitura(uploaded_file):
+    """
+    Lê e classifica a conversa por semestre, sem os sentimentos: basta para as métricas, os
+    gráficos temporais e as interações, exibidos enquanto os sentimentos são calculados. Só a
+    leitura em ordem cronológica fica em cache, sem tabela indexada, e a análise em segundo
+    plano parte dela em vez de ler de novo
+    """
+    return classificar_mensagens(process_whatsapp_chat(uploaded_file))
+
+def preparar_analise(uploaded_file, file_hash: str, armazem: ArmazemParquet, progresso=None, cancelamento=None):
+    """
+    Lê e analisa os sentimentos da conversa inteira uma única vez (ou carrega do disco) e
+    indexa por participante
+    """
+    df_analysis, origem = analisar_chat(uploaded_file, armazem, file_hash, progresso, cancelamento)
+    return (*indexar_conversa(df_analysis), resumo_sentimentos(df_analysis), origem)
+
+def analisar_em_segundo_plano(conteudo: bytes, file_hash: str, armazem: ArmazemParquet, cache: CacheLRU,
+                              lido: pd.DataFrame, grupo: AnaliseGrupo, progresso, cancelamento):
+    """
+    Análise executada em uma Tarefa a partir da leitura já feita: só os sentimentos e a gravação
+    no armazém. A tarefa lê uma cópia do conteúdo, não o arquivo enviado usado pelo script. O
+    resultado fica no cache compartilhado, de onde saem a leitura e o que dependia dela
+    """
+    df_analysis, origem = analisar_chat(io.BytesIO(conteudo), armazem, file_hash, progresso, cancelamento, lido)
+    if origem is None:
+        # Mesmas linhas da leitura: participantes, descartes e interações continuam valendo
+        tabela, fatias = indexar_participantes(df_analysis)
+        indice = (tabela, fatias, list(lido['Telefone'].unique()), lido.attrs.get('descartes', {}), grupo)
+    else:
+        indice = indexar_conversa(df_analysis)
+    analise = (*indice, resumo_sentimentos(df_analysis), origem)
+    cache.guardar(("analise", file_hash), analise)
+    for chave in (("leitura", file_hash), ("grupo", file_hash), ("agregados", file_hash, False)):
+        cache.descartar(chave)
+    return analise
+
+def preparar_nuvem(cache: CacheLRU, file_hash: str, tabela: pd.DataFrame, participante: str,
+                   progresso, cancelamento):
+    """
+    Imagem da nuvem de palavras do participante (ou None sem palavras), executada em uma Tarefa.
+    As contagens de todos os participantes são calculadas uma vez por upload a partir do texto
+    já limpo; a imagem (etapa cara do layout) fica em cache por participante e tamanho
+    """
+    progresso(0.0, "frequências")
+    frequencias, _ = cache.obter(("frequencias", file_hash), lambda: frequencias_por_participante(tabela))
+    palavras = frequencias_do_participante(frequencias, participante, limite=MAX_PALAVRAS_NUVEM)
+    if not palavras:
+        return None
+    if cancelamento.is_set():
+        raise AnaliseCancelada()
+    progresso(0.5, "nuvem")
+    imagem, _ = cache.obter(
+        ("nuvem", file_hash, participante, 800, 400),
+        lambda: gerar_nuvem_palavras(palavras, width=800, height=400)
+    )
+    return imagem
+
+def executar_em_segundo_plano(chave: tuple, rotulo: str, funcao, *args):
+    """
+    Executa funcao em uma Tarefa da sessão (reaproveitada entre reruns pela chave) e exibe uma
+    barra de progresso até ela terminar. Se o script for interrompido por um rerun, a tarefa
+    continua e o rerun seguinte volta a acompanhá-la.
+    """
+    tarefas = st.session_state.setdefault("tarefas", {})
+    if chave not in tarefas:
+        tarefas[chave] = Tarefa(funcao, *args)
+    tarefa = tarefas[chave]
+    barra = st.progress(tarefa.progresso, text=rotulo)
+    while not tarefa.aguardar(0.2):
+        barra.progress(tarefa.progresso, text=f"{rotulo} — {tarefa.etapa} {tarefa.progresso:.0%}")
+    barra.empty()
+    tarefas.pop(chave, None)
+    desempenho.registrar(tarefa.medicoes)
+    return tarefa.resultado()
+
+def cancelar_tarefas(manter=lambda chave: False):
+    """Cancela e descarta as tarefas de fundo da sessão cujas chaves não devem ser mantidas"""
+    tarefas = st.session_state.setdefault("tarefas", {})
+    for chave in [chave for chave in tarefas if not manter(chave)]:
+        tarefas.pop(chave).cancelar()
+
+def show_cache_status(painel, cache: CacheLRU, etapas: dict):
+    """Exibe no painel da sidebar de onde veio cada etapa (memória, disco, incremental ou processada) e os totais do cache"""
+    origens = {
+        "memória": "✅ cache em memória",
+        "disco": "💾 cache em disco",
+        "incremental": "➕ só mensagens novas (exportação anterior em disco)",
+        None: "🔄 processado",
+    }
+    with painel.expander("⚡ Cache"):
+        for etapa, origem in etapas.items():
+            st.markdown(f"{origens[origem]} — {etapa}")
+        st.caption(
+            f"Memória: {cache.acertos} acertos · {cache.falhas} falhas · "
+            f"{len(cache)} itens · {cache.bytes_usados / 2**20:.0f}/{LIMITE_CACHE_MB} MB"
+        )
+        armazem = obter_armazem()
+        st.caption(f"Disco: {armazem.tamanho_total() / 2**20:.0f}/{armazem.max_bytes / 2**20:.0f} MB")
+
+def show_descartes(descartes: dict):
+    """Exibe na sidebar quantas mensagens foram desconsideradas na leitura, por motivo"""
+    rotulos = {
+        "midia": "📎 Mídias ocultas",
+        "apagada": "🗑️ Mensagens apagadas",
+        "link": "🔗 Mensagens com links",
+        "sistema": "⚙️ Eventos do sistema",
+        "vazia": "▫️ Mensagens vazias",
+    }
+    with st.sidebar.expander("🧹 Mensagens desconsideradas"):
+        if not any(descartes.values()):
+            st.caption("Nenhuma mensagem desconsiderada")
+        for motivo, quantidade in descartes.items():
+            st.markdown(f"{rotulos.get(motivo, motivo)}: {quantidade:,}")
+
+def show_desempenho(painel):
+    """Exibe no painel da sidebar as etapas medidas nesta execução do script"""
+    if not desempenho.ativo():
+        return
+    medicoes = desempenho.medicoes()
+    with painel:
+        if not medicoes:
+            st.caption("Nenhuma etapa executada nesta execução (resultados vindos do cache)")
+            return
+        tabela = pd.DataFrame(medicoes, columns=desempenho.Medicao._fields)
+        tabela['memoria_pico_mb'] = tabela.pop('memoria_pico_bytes') / 2**20
+        st.dataframe(
+            tabela.style.format({'segundos': '{:.3f}', 'memoria_pico_mb': '{:.1f}'}, na_rep='—'),
+            hide_index=True, use_container_width=True
+        )
+        st.caption("Etapas aninhadas (ex.: filtro dentro de leitura) também contam no tempo da etapa externa")
+
+@cronometrado('nuvem')
+def gerar_nuvem_palavras(palavras: dict, width: int, height: int):
+    """Gera a imagem da nuvem de palavras a partir das contagens já calculadas"""
+    from wordcloud import WordCloud
+    wordcloud = WordCloud(
+        width=width,
+        height=height,
+        background_color='white',
+        max_words=MAX_PALAVRAS_NUVEM
+    ).generate_from_frequencies(palavras)
+    return wordcloud.to_image()
+
 def create_main_metrics(df: pd.DataFrame):
     """Cria as métricas principais na interface"""
     col1, col2, col3 = st.columns(3)
     with col1:
         st.metric("Total de Mensagens", len(df))
     with col2:
-        st.metric("Dias ativos", df['Dia'].nunique())
+        st.metric("Dias ativos", extrair_dia(df).nunique())
     with col3:
-        st.metric("Primeira participação", df['Dia'].min().strftime('%d/%m/%Y'))
+        st.metric("Primeira participação", df['Data_Hora'].min().strftime('%d/%m/%Y'))
+
+@cronometrado('grafico_sentimentos')
+def plot_sentiment_evolution(mensal: pd.DataFrame):
+    """Gera o gráfico de evolução temporal de sentimentos a partir das contagens mensais do participante"""
+    import numpy as np
+    import plotly.graph_objects as go
 
-def plot_sentiment_evolution(df: pd.DataFrame):
-    """Gera o gráfico de evolução temporal de sentimentos"""
-    # Converter a coluna 'Dia' para datetime
-    df['Dia'] = pd.to_datetime(df['Dia'], errors='coerce')  # Adicionado conversão segura
-    
-    # Remover linhas com datas inválidas (caso existam)
-    df = df.dropna(subset=['Dia'])
-    
-    # Criar coluna de mês
-    df['Mês'] = df['Dia'].dt.to_period('M').dt.to_timestamp()  # Corrigido nome da coluna
-    
-    # Restante do código permanece igual...
-    monthly_sentiment = df.groupby(['Mês', 'sentimento']).size().unstack(fill_value=0)
-    
     monthly_data = pd.DataFrame({
-        'Mês': monthly_sentiment.index,
-        'Positivo': monthly_sentiment.get('positivo', 0),
-        'Negativo': -monthly_sentiment.get('negativo', 0)
+        'Mês': mensal.index,
+        'Positivo': mensal.get('positivo', 0),
+        'Negativo': -mensal.get('negativo', 0)
     })
 
-    # ... (restante do código da função)
     fig = go.Figure()
     fig.add_trace(go.Scatter(
         x=monthly_data['Mês'],
@@ -113,6 +280,48 @@ def plot_sentiment_evolution(df: pd.DataFrame):
     )
     return fig
 
+@cronometrado('grafico_interacoes')
+def plot_interacoes(grupo: AnaliseGrupo, destaque: str, max_conexoes: int):
+    """Rede de interações com os pares que mais trocaram respostas, em layout circular"""
+    import numpy as np
+    import plotly.graph_objects as go
+
+    arestas = arestas_nao_direcionadas(grupo.pares, max_conexoes)
+    nos = pd.unique(np.concatenate([arestas['a'].to_numpy(), arestas['b'].to_numpy()]))
+    posicoes = dict(zip(nos, layout_circular(len(nos))))
+    maximo = arestas['respostas'].max()
+
+    fig = go.Figure()
+    for aresta in arestas.itertuples():
+        (x0, y0), (x1, y1) = posicoes[aresta.a], posicoes[aresta.b]
+        fig.add_trace(go.Scatter(
+            x=[x0, x1], y=[y0, y1], mode='lines', hoverinfo='text',
+            text=f"{aresta.a} → {aresta.b}: {aresta.a_para_b}<br>{aresta.b} → {aresta.a}: {aresta.b_para_a}",
+            line=dict(width=1 + 7 * aresta.respostas / maximo,
+                      color='#FF7F50' if destaque in (aresta.a, aresta.b) else '#B0BEC5'),
+            showlegend=False
+        ))
+
+    comparacao = grupo.participantes.set_axis(grupo.participantes.index.astype(str)).reindex(nos)
+    xy = np.array([posicoes[no] for no in nos])
+    fig.add_trace(go.Scatter(
+        x=xy[:, 0], y=xy[:, 1], mode='markers+text', text=nos, textposition='top center',
+        marker=dict(
+            size=10 + 30 * np.sqrt(comparacao['mensagens'] / comparacao['mensagens'].max()),
+            color=['#FF7F50' if no == destaque else '#4C78A8' for no in nos]
+        ),
+        customdata=comparacao[['mensagens', 'respostas_enviadas', 'respostas_recebidas']].to_numpy(),
+        hovertemplate="%{text}<br>%{customdata[0]} mensagens<br>"
+                      "%{customdata[1]} respostas enviadas · %{customdata[2]} recebidas<extra></extra>",
+        showlegend=False
+    ))
+    fig.update_layout(
+        title='Quem responde a quem',
+        xaxis=dict(visible=False), yaxis=dict(visible=False, scaleanchor='x'),
+        plot_bgcolor='rgba(0,0,0,0)', height=600
+    )
+    return fig
+
 # ==================================================
 # BARRA LATERAL
 # ==================================================
@@ -125,61 +334,124 @@ uploaded_file = st.sidebar.file_uploader(
 )
 
 show_export_tutorial()
+
+# Medição de desempenho: liga/desliga por sessão; a tabela é preenchida no fim do script
+painel_desempenho = st.sidebar.expander("⏱️ Desempenho")
+with painel_desempenho:
+    perfil_ativo = st.toggle("Medir etapas", value=desempenho.ativo())
+    perfil_memoria = st.checkbox(
+        "Incluir pico de memória (tracemalloc)", value=desempenho.memoria(), disabled=not perfil_ativo
+    )
+desempenho.ativar(perfil_ativo, perfil_memoria)
+desempenho.limpar()
+
+# Dependências da análise importadas só depois de a barra lateral ser desenhada, para que o
+# upload apareça sem esperar pandas e pyarrow; plotly e wordcloud são importados nas seções
+# que os usam e o nltk/textblob na primeira análise de sentimentos
+import pandas as pd
+
+from agregados import construir_agregados
+from armazenamento import ArmazemParquet
+from auxiliar import (
+    AnaliseCancelada, hash_arquivo, estatisticas_sentimento, indexar_participantes, resumo_sentimentos,
+    extrair_dia, frequencias_por_participante, frequencias_do_participante, classificar_mensagens,
+    process_whatsapp_chat
+)
+from cache_memoria import CacheLRU
+from exportacao import FORMATOS, gerar_exportacao, gerar_exportacao_participantes
+from grupo import (
+    INTERVALO_SESSAO, JANELA_RESPOSTA, AnaliseGrupo, analisar_grupo, arestas_nao_direcionadas,
+    layout_circular
+)
+from pipeline import analisar_chat
+from tarefas import Tarefa
+
 # ==================================================
 # CORPO PRINCIPAL
 # ==================================================
 
 if uploaded_file is not None:
-    # Processamento inicial dos dados
-    df = process_whatsapp_chat(uploaded_file)
+    # Leitura e sentimentos da conversa inteira, reaproveitados entre reruns pelo hash do
+    # conteúdo (memória) e entre sessões pelo armazém Parquet (disco), que também permite
+    # processar só o final de uma nova exportação da mesma conversa; cada participante é
+    # um intervalo contíguo da tabela
+    cache = obter_cache()
+    file_hash = obter_hash_upload(uploaded_file)
+    # Um novo upload cancela as tarefas em segundo plano do arquivo anterior
+    cancelar_tarefas(lambda chave: chave[1] == file_hash)
+
+    analise = cache.consultar(("analise", file_hash))
+    origem_analise = "memória"
+    if analise is None and file_hash in obter_armazem():
+        analise, _ = cache.obter(
+            ("analise", file_hash), lambda: preparar_analise(uploaded_file, file_hash, obter_armazem())
+        )
+        origem_analise = analise[-1]
+    if analise is not None:
+        tabela_sentimentos, fatias, participantes, descartes, grupo = analise[:5]
+    else:
+        # Sem análise pronta, só a leitura (rápida) é feita agora; os sentimentos são
+        # calculados em segundo plano e as seções que dependem deles aparecem ao final
+        lido, _ = cache.obter(("leitura", file_hash), lambda: preparar_leitura(uploaded_file))
+        # Enquanto isso a leitura é usada em ordem cronológica, sem indexar por participante
+        tabela_sentimentos, fatias = lido, None
+        participantes = list(lido['Telefone'].unique())
+        descartes = lido.attrs.get('descartes', {})
+        grupo, _ = cache.obter(("grupo", file_hash), lambda: analisar_grupo(lido))
+    # Preenchido ao final, quando a origem da análise é conhecida
+    painel_cache = st.sidebar.container()
+    show_descartes(descartes)
     
-    if 'Telefone' not in df.columns:
+    if 'Telefone' not in tabela_sentimentos.columns:
         st.error("Erro na estrutura dos dados: coluna 'Telefone' não encontrada")
         st.stop()
+    if not participantes:
+        st.warning("Nenhuma mensagem encontrada: verifique se o arquivo é uma conversa exportada do WhatsApp")
+        st.stop()
 
     # Seleção de participante
     participante_selecionado = st.sidebar.selectbox(
         "Selecione o participante:",
-        options=df['Telefone'].unique(),
+        options=participantes,
         index=0
     )
-    
-    df_participante = df[df['Telefone'] == participante_selecionado]
+    # Trocar de participante cancela a nuvem de palavras de outro participante em andamento; a
+    # análise da conversa continua, pois serve a todos os participantes
+    cancelar_tarefas(lambda chave: chave[0] != "nuvem" or chave[2] == participante_selecionado)
+
+    if fatias is not None:
+        df_participante = tabela_sentimentos.iloc[fatias[participante_selecionado]]
+    else:
+        df_participante = tabela_sentimentos[tabela_sentimentos['Telefone'] == participante_selecionado]
+    # Contagens por mês/sentimento, hora, dia da semana e período do semestre de todos os
+    # participantes, calculadas uma vez por upload (e de novo quando os sentimentos ficam
+    # prontos); os gráficos usam só essas tabelas pequenas
+    agregados, _ = cache.obter(
+        ("agregados", file_hash, analise is not None), lambda: construir_agregados(tabela_sentimentos)
+    )
     
     # Seção principal
     st.header(f"🔍 Análise de {participante_selecionado}")
     create_main_metrics(df_participante)
     
-    # Análise de sentimentos
+    # Análise de sentimentos: preenchida ao final, quando a análise em segundo plano termina
     st.subheader("📊 Análise de Sentimentos")
-    df_with_sentiment, sentiment_stats = analyze_sentiments(df_participante)
-    
-    cols = st.columns(3)
-    cols[0].metric("Positivas", f"{sentiment_stats['percent_positivo']:.1f}%")
-    cols[1].metric("Negativas", f"{sentiment_stats['percent_negativo']:.1f}%")
-    cols[2].metric("Neutras", f"{sentiment_stats['percent_neutro']:.1f}%")
-    
-    # Gráficos de sentimentos
-    col1, col2 = st.columns([3, 2])
-    with col1:
-        st.plotly_chart(plot_sentiment_evolution(df_with_sentiment), use_container_width=True)
-    with col2:
-        fig_pie = px.pie(
-            names=list(sentiment_stats['contagem_sentimentos'].keys()),
-            values=list(sentiment_stats['contagem_sentimentos'].values()),
-            title='Distribuição de Sentimentos'
-        )
-        st.plotly_chart(fig_pie, use_container_width=True)
+    secao_sentimentos = st.container()
 
     # Visualização temporal
+    import plotly.express as px
+
     st.subheader("⏰ Padrões Temporais")
     col1, col2 = st.columns(2)
     
     with col1:
         # Gráfico 2: Horário preferido
         st.subheader(f"Distribuição por horário")
-        fig_hourly = px.histogram(df_participante, x='Horário', nbins=24, 
-                                color_discrete_sequence=['#FFA07A'])
+        with medir('grafico_horario'):
+            por_hora = agregados.por_hora.loc[participante_selecionado]
+            fig_hourly = px.bar(x=por_hora.index, y=por_hora.to_numpy(),
+                                color_discrete_sequence=['#FFA07A'], labels={'x': 'Horário', 'y': 'Mensagens'})
+            fig_hourly.update_layout(bargap=0.1)
         st.plotly_chart(fig_hourly, use_container_width=True)
     
     with col2:
@@ -187,101 +459,198 @@ if uploaded_file is not None:
         st.subheader("Distribuição por dia")
 
         try:
-            # Converter para datetime se necessário
-            if not pd.api.types.is_datetime64_any_dtype(df_participante["Dia"]):
-                df_participante["Dia"] = pd.to_datetime(df_participante["Dia"], errors='coerce')
-            
-            # Extrair nome do dia em português
-            dias_portugues = {
-                'Monday': 'Segunda',
-                'Tuesday': 'Terça',
-                'Wednesday': 'Quarta',
-                'Thursday': 'Quinta',
-                'Friday': 'Sexta',
-                'Saturday': 'Sábado',
-                'Sunday': 'Domingo'
-            }
-            
-            # Criar coluna com dias em português
-            df_participante["Dia da Semana"] = df_participante["Dia"].dt.day_name().map(dias_portugues)
-            
-            # Ordem correta em português
+            # Ordem correta em português (0 = segunda-feira, como em dt.dayofweek)
             ordem_dias = ['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo']
             
-            # Contagem e ordenação
-            contagem_dias = (
-                df_participante["Dia da Semana"]
-                .value_counts()
-                .reindex(ordem_dias, fill_value=0)
-                .reset_index()
-            )
-            contagem_dias.columns = ["Dia da Semana", "Mensagens"]
+            # Contagem por número do dia e ordenação
+            contagem_dias = pd.DataFrame({
+                "Dia da Semana": ordem_dias,
+                "Mensagens": agregados.por_dia_semana.loc[participante_selecionado].to_numpy()
+            })
 
             # Criar gráfico
-            fig = px.bar(
-                contagem_dias,
-                x="Dia da Semana",
-                y="Mensagens",
-                color="Dia da Semana",
-                color_discrete_sequence=px.colors.sequential.Viridis,
-                labels={'Mensagens': 'Total de Mensagens', 'Dia da Semana': ''},
-            )
-            
-            # Ajustes finais
-            fig.update_layout(
-                xaxis={'categoryorder': 'array', 'categoryarray': ordem_dias},
-                showlegend=False,
-                hovermode="x unified"
-            )
+            with medir('grafico_dia_semana'):
+                fig = px.bar(
+                    contagem_dias,
+                    x="Dia da Semana",
+                    y="Mensagens",
+                    color="Dia da Semana",
+                    color_discrete_sequence=px.colors.sequential.Viridis,
+                    labels={'Mensagens': 'Total de Mensagens', 'Dia da Semana': ''},
+                )
+
+                # Ajustes finais
+                fig.update_layout(
+                    xaxis={'categoryorder': 'array', 'categoryarray': ordem_dias},
+                    showlegend=False,
+                    hovermode="x unified"
+                )
             
             st.plotly_chart(fig, use_container_width=True)
 
         except Exception as e:
             st.error(f"Erro ao gerar gráfico de dias: {str(e)}")
-            st.write("Dados usados:", df_participante[["Dia"]].head())
+            st.write("Dados usados:", df_participante[["Data_Hora"]].head())
 
-    # Nuvem de palavras
-    st.subheader("💬 Palavras Mais Frequentes")
-    text = " ".join(df_participante["Mensagem"].dropna())
-    
-    if text:
-        wordcloud = WordCloud(
-            width=800, 
-            height=400, 
-            background_color='white',
-            stopwords=stopwords_pt
-        ).generate(text)
-        
-        st.image(wordcloud.to_image(), use_container_width=True)
+    if agregados.por_periodo is not None:
+        st.subheader("Distribuição por período do semestre")
+        por_periodo = (
+            agregados.por_periodo.loc[participante_selecionado]
+            .rename('Mensagens')
+            .reset_index()
+        )
+        with medir('grafico_periodo'):
+            fig_periodo = px.bar(
+                por_periodo, x='Semestre', y='Mensagens', color='Periodo_Semestre',
+                labels={'Periodo_Semestre': 'Período'}
+            )
+        st.plotly_chart(fig_periodo, use_container_width=True)
+
+    # Interações do grupo: respostas entre pares e sessões, calculadas uma vez por upload
+    st.subheader("🕸️ Interações do Grupo")
+    if grupo.pares.empty:
+        st.info("Não há respostas entre participantes diferentes nesta conversa")
     else:
-        st.warning("Não há mensagens textuais para exibir")
+        cols = st.columns(3)
+        cols[0].metric("Sessões de conversa", f"{len(grupo.sessoes):,}")
+        cols[1].metric("Duração mediana", f"{grupo.sessoes['duracao_min'].median():.0f} min")
+        cols[2].metric("Mensagens por sessão (mediana)", f"{grupo.sessoes['mensagens'].median():.0f}")
+
+        max_conexoes = len(grupo.pares)
+        if max_conexoes > 5:
+            max_conexoes = st.slider(
+                "Conexões exibidas", min_value=5, max_value=min(200, max_conexoes), value=min(50, max_conexoes),
+                help="Pares de participantes com mais respostas trocadas"
+            )
+        st.plotly_chart(plot_interacoes(grupo, participante_selecionado, max_conexoes), use_container_width=True)
+
+        with st.expander("📊 Comparação entre participantes"):
+            st.dataframe(
+                grupo.participantes.style.format({'latencia_mediana_s': '{:.0f}'}, na_rep='—'),
+                use_container_width=True
+            )
+            st.caption(
+                f"Resposta: mensagem até {JANELA_RESPOSTA.total_seconds() / 60:.0f} min após a de outro participante. "
+                f"Sessão: mensagens separadas por no máximo {INTERVALO_SESSAO.total_seconds() / 3600:.0f} h."
+            )
+        with st.expander(f"⏱️ Tempos de resposta de {participante_selecionado}"):
+            respondente = grupo.pares.index.get_level_values('respondente')
+            st.dataframe(
+                grupo.pares[respondente == participante_selecionado].droplevel('respondente'),
+                use_container_width=True
+            )
+
+    # Nuvem de palavras: gerada em segundo plano depois dos sentimentos
+    st.subheader("💬 Palavras Mais Frequentes")
+    secao_nuvem = st.container()
 
     # Dados brutos
     st.subheader("📋 Últimas Mensagens")
     st.dataframe(
-        df_participante[['Dia', 'Horário', 'Mensagem']]
-        .sort_values('Dia', ascending=False)
+        df_participante[['Data_Hora', 'Mensagem']]
+        .sort_values('Data_Hora', ascending=False)
         .head(20)
-        .style.format({'Dia': lambda t: t.strftime("%d/%m/%Y %H:%M")}),
+        .style.format({'Data_Hora': lambda t: t.strftime("%d/%m/%Y %H:%M")}),
         height=400
     )
 
+    if analise is None:
+        with secao_sentimentos:
+            analise = executar_em_segundo_plano(
+                ("analise", file_hash), "Analisando sentimentos", analisar_em_segundo_plano,
+                uploaded_file.getvalue(), file_hash, obter_armazem(), cache, lido, grupo
+            )
+        origem_analise = analise[-1]
+        tabela_sentimentos, fatias = analise[:2]
+        df_participante = tabela_sentimentos.iloc[fatias[participante_selecionado]]
+        agregados, _ = cache.obter(
+            ("agregados", file_hash, True), lambda: construir_agregados(tabela_sentimentos)
+        )
+    resumo_grupo = analise[5]
+    show_cache_status(painel_cache, cache, {"Análise da conversa": origem_analise})
+
+    with secao_sentimentos:
+        sentiment_stats = estatisticas_sentimento(df_participante)
+
+        cols = st.columns(3)
+        cols[0].metric("Positivas", f"{sentiment_stats['percent_positivo']:.1f}%")
+        cols[1].metric("Negativas", f"{sentiment_stats['percent_negativo']:.1f}%")
+        cols[2].metric("Neutras", f"{sentiment_stats['percent_neutro']:.1f}%")
+
+        # Gráficos de sentimentos
+        col1, col2 = st.columns([3, 2])
+        with col1:
+            st.plotly_chart(plot_sentiment_evolution(agregados.mensal.loc[participante_selecionado]), use_container_width=True)
+        with col2:
+            with medir('grafico_distribuicao'):
+                fig_pie = px.pie(
+                    names=list(sentiment_stats['contagem_sentimentos'].keys()),
+                    values=list(sentiment_stats['contagem_sentimentos'].values()),
+                    title='Distribuição de Sentimentos'
+                )
+            st.plotly_chart(fig_pie, use_container_width=True)
+
+        with st.expander("👥 Sentimentos de todos os participantes"):
+            st.dataframe(
+                resumo_grupo.style.format({
+                    'polaridade_media': '{:.3f}',
+                    'percent_positivo': '{:.1f}%',
+                    'percent_negativo': '{:.1f}%',
+                    'percent_neutro': '{:.1f}%',
+                }),
+                use_container_width=True
+            )
+
+    with secao_nuvem:
+        imagem_nuvem = cache.consultar(("nuvem", file_hash, participante_selecionado, 800, 400))
+        if imagem_nuvem is None:
+            imagem_nuvem = executar_em_segundo_plano(
+                ("nuvem", file_hash, participante_selecionado), "Gerando nuvem de palavras", preparar_nuvem,
+                cache, file_hash, tabela_sentimentos, participante_selecionado
+            )
+        if imagem_nuvem is not None:
+            st.image(imagem_nuvem, use_container_width=True)
+        else:
+            st.warning("Não há mensagens textuais para exibir")
+
     # Exportação de dados
     st.subheader("📤 Exportar Dados")
-    buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-        df_participante.to_excel(writer, index=False, sheet_name='Dados')
-    
-    st.download_button(
-        label="Baixar dados completos (XLSX)",
-        data=buffer.getvalue(),
-        file_name=f'whatsapp_{participante_selecionado}.xlsx',
-        mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    col1, col2 = st.columns(2)
+    formato = col1.selectbox(
+        "Formato", options=list(FORMATOS), format_func=lambda f: FORMATOS[f].rotulo
     )
+    todos = col2.radio(
+        "Participantes", ["Selecionado", "Todos"], horizontal=True,
+        help="Todos: uma planilha por participante (XLSX) ou um ZIP com um arquivo por participante"
+    ) == "Todos"
+
+    # O arquivo só é gerado quando pedido e fica em cache para os reruns seguintes
+    chave_exportacao = ("exportacao", file_hash, None if todos else participante_selecionado, formato)
+    conteudo = cache.consultar(chave_exportacao)
+    if conteudo is None and st.button("Preparar arquivo para download"):
+        linhas_exportadas = len(tabela_sentimentos) if todos else len(df_participante)
+        with st.spinner("Gerando arquivo..."), medir(f'exportacao_{formato}', linhas_exportadas):
+            if todos:
+                conteudo = gerar_exportacao_participantes(tabela_sentimentos, fatias, formato)
+            else:
+                conteudo = gerar_exportacao(df_participante, formato)
+            cache.guardar(chave_exportacao, conteudo)
+
+    if conteudo is not None:
+        extensao = "zip" if todos and formato != "xlsx" else FORMATOS[formato].extensao
+        st.download_button(
+            label=f"Baixar dados completos ({extensao.upper()})",
+            data=conteudo,
+            file_name=f'whatsapp_{"todos" if todos else participante_selecionado}.{extensao}',
+            mime="application/zip" if extensao == "zip" else FORMATOS[formato].mime
+        )
 
 else:
+    cancelar_tarefas()
     st.info("ℹ️ Por favor, carregue um arquivo de conversa do WhatsApp para iniciar a análise")
 
+show_desempenho(painel_desempenho)
+
 
 with st.sidebar:
     st.markdown("---")
@@ -0,0 +1,583 @@
+"""
+Leitura das conversas exportadas do WhatsApp: detecção do dialeto, parser em blocos, filtro de
+mensagens sem conteúdo e o esquema compacto do DataFrame.
+
+Depende apenas de numpy e pandas, para que o parser possa ser importado sem as bibliotecas
+de análise de sentimentos.
+"""
+import codecs
+import hashlib
+import importlib.util
+import io
+import itertools
+import os
+import re
+from collections import Counter
+from typing import Dict, NamedTuple, Optional, Pattern, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from desempenho import cronometrado
+
+# Tamanho padrão dos blocos lidos do arquivo (1 MiB)
+CHUNK_SIZE = 1 << 20
+
+
+def _open_source(file, inicio: int = 0):
+    """Retorna um stream binário para um caminho em disco ou um UploadedFile do Streamlit,
+    posicionado no byte inicio.
+
+    O segundo valor indica se o stream foi aberto aqui e deve ser fechado pelo chamador.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        stream, owned = open(file, 'rb'), True
+    elif not hasattr(file, 'read'):
+        stream, owned = io.BytesIO(file.getvalue()), True
+    else:
+        stream, owned = file, False
+    if hasattr(stream, 'seek'):
+        stream.seek(inicio)
+    return stream, owned
+
+
+def hash_arquivo(file, chunk_size: int = CHUNK_SIZE) -> str:
+    """Hash do conteúdo do arquivo (caminho ou UploadedFile), lido em blocos."""
+    return hash_prefixos(file, (), chunk_size)[0]
+
+
+def hash_prefixos(file, tamanhos, chunk_size: int = CHUNK_SIZE) -> Tuple[str, Dict[int, str]]:
+    """
+    Calcula, em uma única leitura, o hash do arquivo inteiro e o hash dos seus primeiros
+    n bytes para cada n em tamanhos. Como o hash é incremental, o hash de um prefixo é igual ao
+    hash_arquivo de uma exportação anterior cujo conteúdo seja exatamente esse prefixo.
+
+    Returns:
+        Tuple contendo:
+        - Hash do arquivo inteiro
+        - Dicionário tamanho -> hash do prefixo (tamanhos maiores que o arquivo são omitidos)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    pendentes = sorted(set(tamanhos))
+    prefixos = {}
+    lidos = 0
+    stream, owned = _open_source(file)
+    try:
+        for chunk in iter(lambda: stream.read(chunk_size), b''):
+            while pendentes and pendentes[0] <= lidos + len(chunk):
+                tamanho = pendentes.pop(0)
+                parcial = digest.copy()
+                parcial.update(memoryview(chunk)[:tamanho - lidos])
+                prefixos[tamanho] = parcial.hexdigest()
+            digest.update(chunk)
+            lidos += len(chunk)
+    finally:
+        if owned:
+            stream.close()
+    if pendentes and pendentes[0] == 0:
+        prefixos[0] = hashlib.blake2b(digest_size=16).hexdigest()
+    return digest.hexdigest(), prefixos
+
+
+def iter_line_chunks(file, chunk_size: int = CHUNK_SIZE, inicio: int = 0):
+    """
+    Lê o arquivo em blocos de tamanho fixo, a partir do byte inicio, e gera listas com as
+    linhas completas de cada bloco.
+
+    A linha incompleta no fim de um bloco é guardada e completada com o bloco seguinte,
+    assim como caracteres UTF-8 cortados na fronteira entre blocos.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    stream, owned = _open_source(file, inicio)
+    try:
+        pending = ''
+        while True:
+            chunk = stream.read(chunk_size)
+            final = not chunk
+            lines = (pending + decoder.decode(chunk, final=final)).split('\n')
+            pending = lines.pop()
+            if lines:
+                yield lines
+            if final:
+                break
+        # Mesmo comportamento de split("\n"): a última linha é sempre emitida
+        yield [pending]
+    finally:
+        if owned:
+            stream.close()
+
+
+class Dialeto(NamedTuple):
+    """
+    Formato de exportação do WhatsApp: padrão da linha de cabeçalho, formatos de data/hora e
+    padrão das linhas de evento do sistema (cabeçalho sem remetente).
+    """
+    nome: str
+    padrao: Pattern
+    formato_data: str
+    formato_hora: str
+    padrao_sistema: Pattern
+
+
+# Início da linha de cabeçalho (data e hora) por layout e relógio; o remetente e a mensagem
+# vêm em seguida. A ordem de dia/mês e o número de dígitos do ano são inferidos da amostra
+# em detectar_dialeto.
+_PADROES = (
+    # Android 24h: "DD/MM/YYYY HH:MM - Nome: Mensagem"
+    ('android', r'^(\d{1,2}/\d{1,2}/\d{2,4}),? (\d{1,2}:\d{2}) - ', '%H:%M'),
+    # iOS 24h: "[DD/MM/YYYY, HH:MM:SS] Nome: Mensagem"
+    ('ios', r'^\[(\d{1,2}/\d{1,2}/\d{2,4}),? (\d{1,2}:\d{2}:\d{2})\] ', '%H:%M:%S'),
+    # Android 12h: "M/D/YY, H:MM PM - Nome: Mensagem"
+    ('android_12h', r'^(\d{1,2}/\d{1,2}/\d{2,4}),? (\d{1,2}:\d{2}[ \u202f\u00a0][AaPp][Mm]) - ', '%I:%M %p'),
+    # iOS 12h: "[DD/MM/YY, H:MM:SS PM] Nome: Mensagem"
+    ('ios_12h', r'^\[(\d{1,2}/\d{1,2}/\d{2,4}),? (\d{1,2}:\d{2}:\d{2}[ \u202f\u00a0][AaPp][Mm])\] ',
+     '%I:%M:%S %p'),
+)
+# Remetente até o primeiro ':'; a mensagem pode ser vazia (a linha termina no ':' depois do strip)
+_REMETENTE = r'([^:]+?):(?: |$)(.*)'
+_PADROES_COMPILADOS = tuple(
+    (nome, re.compile(cabecalho + _REMETENTE), hora, re.compile(cabecalho))
+    for nome, cabecalho, hora in _PADROES
+)
+
+# Número de linhas não vazias usadas para detectar o dialeto
+AMOSTRA_DIALETO = 500
+
+
+def _inferir_formato_data(datas) -> str:
+    """Infere '%d/%m' ou '%m/%d' e ano com 2 ou 4 dígitos a partir das datas da amostra."""
+    mes_primeiro = False
+    ano_curto = False
+    for data in datas:
+        primeiro, segundo, ano = data.split('/')
+        ano_curto = len(ano) == 2
+        if int(primeiro) > 12:
+            mes_primeiro = False
+            break
+        if int(segundo) > 12:
+            mes_primeiro = True
+            break
+    ano = '%y' if ano_curto else '%Y'
+    return f'%m/%d/{ano}' if mes_primeiro else f'%d/%m/{ano}'
+
+
+def _converter_datas(datas: pd.Series, formato: str) -> Tuple[pd.Series, str]:
+    """
+    Converte as datas com o formato detectado. Se a amostra era ambígua (nenhum dia > 12) e a
+    ordem dia/mês se mostrar errada no restante do arquivo, tenta a ordem inversa.
+
+    Returns:
+        Tuple com as datas convertidas e o formato que de fato as converteu
+    """
+    try:
+        return pd.to_datetime(datas, format=formato), formato
+    except ValueError:
+        primeiro, segundo, ano = formato.split('/')
+        invertido = f'{segundo}/{primeiro}/{ano}'
+        return pd.to_datetime(datas, format=invertido), invertido
+
+
+def obter_dialeto(nome: str, formato_data: str) -> Dialeto:
+    """Reconstrói um dialeto a partir do nome e do formato de data (por exemplo, guardados em cache)."""
+    for candidato, padrao, formato_hora, padrao_sistema in _PADROES_COMPILADOS:
+        if candidato == nome:
+            return Dialeto(nome, padrao, formato_data, formato_hora, padrao_sistema)
+    raise ValueError(f"Dialeto desconhecido: {nome}")
+
+
+# Marcas que podem anteceder o cabeçalho: U+200E (mídias, apagadas e eventos do sistema no iOS)
+# e o BOM no início do arquivo
+MARCAS_INICIO_LINHA = '\u200e\ufeff'
+
+
+def primeira_linha(file, inicio: int = 0) -> str:
+    """Primeira linha não vazia do arquivo a partir do byte inicio ('' se não houver)."""
+    for lines in iter_line_chunks(file, inicio=inicio):
+        for line in lines:
+            if line.strip():
+                return line.strip().lstrip(MARCAS_INICIO_LINHA)
+    return ''
+
+
+def detectar_dialeto(linhas) -> Dialeto:
+    """
+    Detecta o formato da exportação (Android/iOS, 24h/12h, ordem da data) a partir das
+    primeiras linhas da conversa. Sem nenhuma correspondência, assume Android 24h.
+    """
+    amostra = [linha.strip().lstrip(MARCAS_INICIO_LINHA) for linha in linhas if linha.strip()][:AMOSTRA_DIALETO]
+
+    melhor, melhores_datas = _PADROES_COMPILADOS[0], []
+    for candidato in _PADROES_COMPILADOS:
+        datas = [m.group(1) for m in map(candidato[1].match, amostra) if m]
+        if len(datas) > len(melhores_datas):
+            melhor, melhores_datas = candidato, datas
+
+    nome, padrao, formato_hora, padrao_sistema = melhor
+    return Dialeto(nome, padrao, _inferir_formato_data(melhores_datas), formato_hora, padrao_sistema)
+
+
+def _detectar_dialeto_stream(chunks):
+    """
+    Acumula blocos até obter a amostra de detecção (ou o fim do arquivo) e retorna o dialeto
+    junto com um iterador que reemite os blocos acumulados seguidos dos restantes.
+    """
+    acumulados = []
+    amostra = 0
+    for lines in chunks:
+        acumulados.append(lines)
+        amostra += len(lines)
+        if amostra >= AMOSTRA_DIALETO:
+            break
+    dialeto = detectar_dialeto(line for lines in acumulados for line in lines)
+    return dialeto, itertools.chain(acumulados, chunks)
+
+
+# Mensagens descartadas por motivo, reconhecidas pelo início do texto (após a marca U+200E
+# que o iOS coloca antes de avisos e anexos). Eventos do sistema do Android (entrou, saiu,
+# adicionou...) não têm remetente e são reconhecidos pelo padrao_sistema do dialeto; os do
+# iOS vêm com o nome do grupo como remetente e a marca U+200E no início.
+REGRAS_DESCARTE = {
+    'midia': (
+        '<Mídia oculta>', '<Arquivo de mídia oculto>', 'imagem ocultada', 'vídeo omitido',
+        'áudio ocultado', 'figurinha omitida', 'GIF omitido', 'documento omitido', '<anexado:',
+        '<Media omitted>', 'image omitted', 'video omitted', 'audio omitted', 'sticker omitted',
+        'GIF omitted', 'document omitted', '<attached:',
+    ),
+    'apagada': (
+        'Mensagem apagada', 'Esta mensagem foi apagada', 'Você apagou esta mensagem',
+        'This message was deleted', 'You deleted this message',
+    ),
+    'sistema': (
+        '\u200e', 'As mensagens e as chamadas são protegidas com a criptografia',
+        'Messages and calls are end-to-end encrypted',
+    ),
+}
+
+# Eventos do sistema do Android cujo texto tem ': ' (como um assunto entre aspas) e por isso
+# casa com o cabeçalho de mensagem: o "remetente" é o autor seguido de um destes verbos
+EVENTOS_SISTEMA = (
+    'mudou o assunto', 'alterou o assunto', 'mudou a descrição', 'alterou a descrição',
+    'mudou a imagem', 'mudou o nome', 'criou o grupo', 'adicionou', 'removeu', 'saiu',
+    'entrou usando', 'fixou uma mensagem', 'mudou as configurações',
+    'changed the subject', 'changed the group description', "changed this group's icon",
+    'changed the group name', 'created group', 'added', 'removed', 'left', 'joined using',
+    'pinned a message', "changed this group's settings", 'changed the settings',
+)
+_PADRAO_EVENTO = re.compile(' (?:' + '|'.join(map(re.escape, EVENTOS_SISTEMA)) + r')\b')
+
+# Mensagens descartadas por conter o trecho em qualquer posição
+TRECHOS_DESCARTE = {
+    'link': ('https', 'chat.whatsapp.com'),
+}
+
+# Marcas removidas do texto das mensagens editadas
+MARCAS_EDICAO = ('<Esta mensagem foi editada>', '<This message was edited>')
+
+
+# Separa as mensagens de um lote no texto unido percorrido pelo filtro
+SEPARADOR = '\x00'
+
+
+def _inicios(mensagens) -> np.ndarray:
+    """Posição do separador que antecede cada mensagem no texto unido do lote."""
+    comprimentos = np.fromiter(map(len, mensagens), dtype=np.int64, count=len(mensagens)) + 1
+    return np.concatenate(([0], np.cumsum(comprimentos[:-1])))
+
+
+def _indices(inicios: np.ndarray, posicoes) -> list:
+    """Índice da mensagem que contém cada posição do texto unido."""
+    return (np.searchsorted(inicios, posicoes, side='right') - 1).tolist()
+
+
+class FiltroMensagens(NamedTuple):
+    """
+    Regras de descarte compiladas. As mensagens de um lote são unidas em um único texto,
+    separadas por NUL, que é percorrido uma vez pela expressão com os prefixos de todas as
+    regras (ancorados no separador, um grupo por motivo) e uma vez pela busca de cada trecho;
+    apenas as mensagens encontradas passam por código Python.
+    """
+    padrao: Pattern
+    motivos: Tuple[str, ...]
+    trechos: Tuple[Tuple[str, str], ...]
+    marcas_edicao: Tuple[str, ...]
+    padrao_edicao: Pattern
+
+    def classificar_lote(self, mensagens: list) -> Tuple[Dict[int, str], list]:
+        """
+        Classifica as mensagens de um lote.
+
+        Returns:
+            Tuple contendo:
+            - Motivo do descarte ('vazia' ou uma chave das regras) por índice das mensagens
+              descartadas
+            - Mensagens sem a marca de mensagem editada
+        """
+        if not mensagens:
+            return {}, mensagens
+        texto = SEPARADOR + SEPARADOR.join(mensagens) + SEPARADOR
+        if texto.count(SEPARADOR) != len(mensagens) + 1:
+            # Alguma mensagem contém NUL, que seria confundido com o separador
+            mensagens = [mensagem.replace(SEPARADOR, '') for mensagem in mensagens]
+            texto = SEPARADOR + SEPARADOR.join(mensagens) + SEPARADOR
+        inicios = _inicios(mensagens)
+
+        if any(marca in texto for marca in self.marcas_edicao):
+            editadas = _indices(inicios, [match.start() for match in self.padrao_edicao.finditer(texto)])
+            mensagens = self.padrao_edicao.sub('', texto)[1:-1].split(SEPARADOR)
+            for indice in set(editadas):
+                mensagens[indice] = mensagens[indice].rstrip(' \u200e')
+            texto = SEPARADOR + SEPARADOR.join(mensagens) + SEPARADOR
+            inicios = _inicios(mensagens)
+
+        posicoes, motivos = [], []
+        for match in self.padrao.finditer(texto):
+            posicoes.append(match.start())
+            motivos.append(self.motivos[int(match.lastgroup[1:])])
+        for trecho, motivo in self.trechos:
+            posicao = texto.find(trecho)
+            while posicao != -1:
+                posicoes.append(posicao)
+                motivos.append(motivo)
+                posicao = texto.find(trecho, posicao + len(trecho))
+
+        # Os prefixos vêm antes dos trechos e têm prioridade na mesma mensagem
+        descartadas = {}
+        for indice, motivo in zip(_indices(inicios, posicoes), motivos):
+            descartadas.setdefault(indice, motivo)
+        return descartadas, mensagens
+
+    def filtrar_lote(self, lote: dict, descartes: Counter) -> dict:
+        """Remove do lote (dicionário de listas) as mensagens descartadas e as conta em descartes."""
+        descartadas, mensagens = self.classificar_lote(lote['Mensagem'])
+        lote = dict(lote, Mensagem=mensagens)
+        if not descartadas:
+            return lote
+        descartes.update(descartadas.values())
+        manter = np.ones(len(mensagens), dtype=bool)
+        manter[list(descartadas)] = False
+        mascara = manter.tobytes()
+        return {coluna: list(itertools.compress(valores, mascara)) for coluna, valores in lote.items()}
+
+
+def compilar_filtro(regras: Dict[str, Tuple[str, ...]] = REGRAS_DESCARTE,
+                    trechos: Dict[str, Tuple[str, ...]] = TRECHOS_DESCARTE,
+                    marcas_edicao: Tuple[str, ...] = MARCAS_EDICAO) -> FiltroMensagens:
+    """
+    Compila as regras de descarte. Os prefixos formam uma única expressão regular de
+    literais que começa pelo separador, o que permite ao mecanismo de regex saltar direto
+    entre os inícios de mensagem. Os trechos, que podem estar em qualquer posição, são
+    procurados com str.find: uma alternação sem âncora seria testada em cada posição do texto.
+    """
+    grupos = [r'(?P<g0>\s*(?=\x00))'] + [
+        f"(?P<g{indice}>{'|'.join(map(re.escape, literais))})"
+        for indice, literais in enumerate(regras.values(), start=1)
+    ]
+    padrao = '\x00(?:' + grupos[0] + '|\u200e?(?:' + '|'.join(grupos[1:]) + '))'
+    return FiltroMensagens(
+        re.compile(padrao),
+        ('vazia',) + tuple(regras),
+        tuple((trecho, motivo) for motivo, literais in trechos.items() for trecho in literais),
+        tuple(marcas_edicao),
+        re.compile('|'.join(map(re.escape, marcas_edicao))),
+    )
+
+
+FILTRO_PADRAO = compilar_filtro()
+
+
+def iter_chat_batches(file, chunk_size: int = CHUNK_SIZE, inicio: int = 0, dialeto: Optional[Dialeto] = None,
+                      filtro: Optional[FiltroMensagens] = None, descartes: Optional[Counter] = None):
+    """
+    Gera tuplas (dialeto, lote) em que o lote é um dicionário de listas com as mensagens
+    completas de cada bloco lido.
+
+    O dialeto é detectado no primeiro bloco e, a partir daí, apenas um padrão compilado é
+    usado. A mensagem em andamento no fim de um bloco só é emitida no lote seguinte, para que
+    mensagens multilinha divididas entre blocos sejam unidas corretamente. As linhas de
+    continuação são acumuladas em uma lista e unidas uma única vez.
+
+    Eventos do sistema (cabeçalho sem remetente) nunca entram nos lotes. Com um filtro, as
+    mensagens que ele descarta também são retiradas de cada lote antes de emiti-lo; em ambos
+    os casos a contagem por motivo é somada em descartes, se informado.
+
+    Com inicio > 0 a leitura começa nesse byte; um dialeto já conhecido pode ser informado
+    para dispensar a detecção.
+    """
+    chunks = iter_line_chunks(file, chunk_size, inicio)
+    if dialeto is None:
+        dialeto, chunks = _detectar_dialeto_stream(chunks)
+    if descartes is None:
+        descartes = Counter()
+    match_header = dialeto.padrao.match
+    match_sistema = dialeto.padrao_sistema.match
+    busca_evento = _PADRAO_EVENTO.search
+    # Resultado de busca_evento por remetente: os nomes se repetem em quase todas as linhas
+    eventos = {}
+    current_entry = None
+
+    for lines in chunks:
+        batch = {'Dia': [], 'Horário': [], 'Telefone': [], 'Mensagem': []}
+
+        for line in lines:
+            line = line.strip().lstrip(MARCAS_INICIO_LINHA)
+            match = match_header(line)
+            if match:
+                remetente = match.group(3)
+                evento = eventos.get(remetente)
+                if evento is None:
+                    evento = eventos[remetente] = busca_evento(remetente) is not None
+                if evento:
+                    # Evento do sistema com ': ' no texto, tratado como os demais abaixo
+                    match = None
+
+            if match:
+                if current_entry:
+                    _append_entry(batch, current_entry)
+                dia, horario, telefone, mensagem = match.groups()
+                current_entry = (dia, horario, telefone, [mensagem])
+
+            elif match_sistema(line):
+                # Evento do sistema: encerra a mensagem em andamento e é ignorado
+                if current_entry:
+                    _append_entry(batch, current_entry)
+                current_entry = None
+                descartes['sistema'] += 1
+
+            elif current_entry:
+                current_entry[3].append(line)  # Mensagem multilinha
+
+        if filtro is not None:
+            batch = filtro.filtrar_lote(batch, descartes)
+        if batch['Dia']:
+            yield dialeto, batch
+
+    if current_entry:
+        batch = {'Dia': [], 'Horário': [], 'Telefone': [], 'Mensagem': []}
+        _append_entry(batch, current_entry)
+        if filtro is not None:
+            batch = filtro.filtrar_lote(batch, descartes)
+        if batch['Dia']:
+            yield dialeto, batch
+
+
+def _append_entry(batch, entry):
+    batch['Dia'].append(entry[0])
+    batch['Horário'].append(entry[1])
+    batch['Telefone'].append(entry[2])
+    # Linhas em branco no fim pertencem ao espaço entre mensagens, não ao texto; no início,
+    # só aparecem quando a linha do cabeçalho termina no ':'
+    batch['Mensagem'].append('\n'.join(entry[3]).strip('\n'))
+
+
+def _tipo_texto(arrow_strings: bool):
+    """Dtype da coluna Mensagem: strings do Arrow quando disponível, senão object."""
+    if arrow_strings and importlib.util.find_spec('pyarrow') is not None:
+        return 'string[pyarrow]'
+    return object
+
+
+@cronometrado('filtro')
+def filtrar_mensagens(df: pd.DataFrame, filtro: FiltroMensagens = FILTRO_PADRAO) -> pd.DataFrame:
+    """
+    Aplica o filtro a um DataFrame já lido (por exemplo, com process_whatsapp_chat(filtrar=False)):
+    remove as mensagens descartadas, tira as marcas de edição e soma os descartes em
+    df.attrs['descartes'].
+    """
+    descartadas, mensagens = filtro.classificar_lote(df['Mensagem'].tolist())
+    manter = np.ones(len(df), dtype=bool)
+    manter[list(descartadas)] = False
+    filtrado = df[manter].copy()
+    filtrado['Mensagem'] = pd.array(
+        list(itertools.compress(mensagens, manter.tobytes())), dtype=df['Mensagem'].dtype
+    )
+    descartes = Counter(df.attrs.get('descartes', {}))
+    descartes.update(descartadas.values())
+    filtrado.attrs['descartes'] = dict(descartes)
+    return filtrado
+
+
+@cronometrado('leitura')
+def process_whatsapp_chat(file, chunk_size: int = CHUNK_SIZE, arrow_strings: bool = True,
+                          inicio: int = 0, dialeto: Optional[Dialeto] = None,
+                          filtrar: Union[bool, FiltroMensagens] = True):
+    """
+    Lê uma conversa exportada do WhatsApp (UploadedFile do Streamlit ou caminho em disco) em
+    blocos e retorna um DataFrame compacto com as colunas:
+
+    - Data_Hora: datetime64[s] com data, hora e minuto da mensagem
+    - Telefone: category
+    - Mensagem: string[pyarrow] (ou object se arrow_strings=False ou sem pyarrow)
+
+    Dia, hora e dia da semana são derivados de Data_Hora com extrair_dia, extrair_hora e
+    extrair_dia_semana; para_esquema_antigo recria as colunas Dia e Horário.
+
+    inicio e dialeto permitem ler apenas o trecho final de uma exportação com o formato já
+    conhecido. O dialeto usado fica em df.attrs['dialeto'] e o formato de data que converteu
+    o arquivo em df.attrs['formato_data'].
+
+    Mídias ocultas, mensagens apagadas, links, mensagens vazias e eventos do sistema são
+    descartados durante a leitura pelo FILTRO_PADRAO (ou pelo filtro informado em filtrar) e
+    contados por motivo em df.attrs['descartes']. Com filtrar=False apenas os eventos do
+    sistema são descartados.
+    """
+    columns = ['Dia', 'Horário', 'Telefone', 'Mensagem']
+    frames = []
+    filtro = FILTRO_PADRAO if filtrar is True else filtrar or None
+    descartes = Counter()
+
+    for dialeto, batch in iter_chat_batches(file, chunk_size, inicio, dialeto, filtro, descartes):
+        frames.append(pd.DataFrame(batch, columns=columns))
+
+    # Os lotes são concatenados uma única vez no final
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    del frames
+    if dialeto is None:
+        dialeto = detectar_dialeto([])
+    
+    # Conversão de data e hora: a hora é lida sobre a data padrão (1900-01-01) e somada ao dia
+    horarios = df['Horário']
+    if dialeto.formato_hora.endswith('%p'):
+        horarios = horarios.str.replace('[\u202f\u00a0]', ' ', regex=True).str.upper()
+    horarios = pd.to_datetime(horarios, format=dialeto.formato_hora)
+    datas, formato_data = _converter_datas(df['Dia'], dialeto.formato_data)
+    data_hora = datas + (horarios - horarios.dt.normalize())
+
+    compacto = pd.DataFrame({
+        'Data_Hora': data_hora.astype('datetime64[s]'),
+        'Telefone': df['Telefone'].astype('category'),
+        'Mensagem': df['Mensagem'].astype(_tipo_texto(arrow_strings)),
+    }).reset_index(drop=True)
+    compacto.attrs['dialeto'] = dialeto.nome
+    # O formato que converteu o arquivo, não o inferido da amostra: é ele que a leitura
+    # incremental reaproveita
+    compacto.attrs['formato_data'] = formato_data
+    compacto.attrs['descartes'] = dict(descartes)
+    return compacto
+
+
+def extrair_dia(df: pd.DataFrame) -> pd.Series:
+    """Dia de cada mensagem (datetime64 à meia-noite)."""
+    return df['Data_Hora'].dt.normalize()
+
+
+def extrair_hora(df: pd.DataFrame) -> pd.Series:
+    """Hora (0-23) de cada mensagem."""
+    return df['Data_Hora'].dt.hour
+
+
+def extrair_dia_semana(df: pd.DataFrame) -> pd.Series:
+    """Dia da semana de cada mensagem (0 = segunda-feira)."""
+    return df['Data_Hora'].dt.dayofweek
+
+
+def para_esquema_antigo(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte o DataFrame compacto para o esquema anterior: Dia (datetime.date), Horário (hora
+    inteira), Telefone e Mensagem como object. As demais colunas são mantidas.
+    """
+    antigo = df.drop(columns='Data_Hora')
+    antigo.insert(0, 'Dia', df['Data_Hora'].dt.date)
+    antigo.insert(1, 'Horário', extrair_hora(df))
+    antigo['Telefone'] = df['Telefone'].astype(object)
+    antigo['Mensagem'] = df['Mensagem'].astype(object)
+    return antigo
@@ -0,0 +1,154 @@
+import os
+import threading
+from collections import Counter
+from typing import Optional, Tuple
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from armazenamento import ArmazemParquet
+from auxiliar import (
+    Progresso, analyze_sentiments, classificar_mensagens, hash_prefixos, obter_dialeto, primeira_linha,
+    process_whatsapp_chat
+)
+
+
+def _analisar(file, progresso: Optional[Progresso] = None, cancelamento: Optional[threading.Event] = None,
+              lido: Optional[pd.DataFrame] = None, **kwargs) -> pd.DataFrame:
+    """
+    Leitura, classificação por semestre e sentimentos de uma conversa (ou de um trecho dela).
+    Com lido (a leitura já classificada), só os sentimentos são calculados.
+    """
+    df = lido if lido is not None else classificar_mensagens(process_whatsapp_chat(file, **kwargs))
+    df_analysis, _ = analyze_sentiments(df, progresso=progresso, cancelamento=cancelamento)
+    return df_analysis
+
+
+def _metadados(df: pd.DataFrame, tamanho_bytes: int) -> dict:
+    return {
+        'tamanho_bytes': tamanho_bytes,
+        'dialeto': df.attrs.get('dialeto'),
+        'formato_data': df.attrs.get('formato_data'),
+        'descartes': df.attrs.get('descartes', {}),
+    }
+
+
+def _concatenar(anterior: pd.DataFrame, novo: pd.DataFrame) -> pd.DataFrame:
+    """Junta o resultado armazenado com o das mensagens novas mantendo Telefone categórico."""
+    telefones = union_categoricals([anterior['Telefone'], novo['Telefone']])
+    df = pd.concat([anterior, novo], ignore_index=True)
+    df['Telefone'] = telefones
+    df.attrs = dict(novo.attrs)
+    descartes = Counter(anterior.attrs.get('descartes', {}))
+    descartes.update(novo.attrs.get('descartes', {}))
+    df.attrs['descartes'] = dict(descartes)
+    return df
+
+
+def _localizar_anterior(file, armazem: ArmazemParquet) -> Tuple[str, Optional[str], Optional[dict]]:
+    """
+    Procura no armazém uma exportação anterior cujo conteúdo seja um prefixo do arquivo.
+
+    O hash incremental do arquivo é capturado no tamanho de cada exportação armazenada e
+    comparado com o hash dela, em uma única leitura e sem reprocessar o prefixo.
+
+    Returns:
+        Tuple com o hash do arquivo, o hash da maior exportação anterior encontrada e os
+        metadados dela (ou None, None)
+    """
+    candidatos = {}
+    for chave in armazem.chaves():
+        metadados = armazem.metadados(chave)
+        if metadados and metadados.get('dialeto') and metadados.get('tamanho_bytes'):
+            candidatos[chave] = metadados
+
+    file_hash, prefixos = hash_prefixos(file, [m['tamanho_bytes'] for m in candidatos.values()])
+
+    encontrados = [
+        (metadados['tamanho_bytes'], chave) for chave, metadados in candidatos.items()
+        if chave != file_hash and prefixos.get(metadados['tamanho_bytes']) == chave
+    ]
+    if not encontrados:
+        return file_hash, None, None
+    _, chave = max(encontrados)
+    return file_hash, chave, candidatos[chave]
+
+
+def analisar_chat(file, armazem: Optional[ArmazemParquet] = None, file_hash: Optional[str] = None,
+                  progresso: Optional[Progresso] = None,
+                  cancelamento: Optional[threading.Event] = None,
+                  lido: Optional[pd.DataFrame] = None) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    Lê a conversa, classifica por semestre e analisa os sentimentos, reaproveitando o
+    armazém em disco:
+
+    - se o mesmo arquivo já foi analisado, carrega o resultado gravado;
+    - se uma exportação anterior da mesma conversa é um prefixo deste arquivo, processa
+      apenas as mensagens acrescentadas depois dela e junta com o resultado gravado.
+
+    Args:
+        file: UploadedFile do Streamlit ou caminho em disco
+        armazem: Armazenamento em disco; se omitido, sempre processa
+        file_hash: Hash do conteúdo, se já calculado
+        progresso, cancelamento: Repassados a analyze_sentiments; uma análise cancelada
+            levanta AnaliseCancelada e não grava nada no armazém
+        lido: Leitura já classificada do arquivo inteiro (process_whatsapp_chat seguido de
+            classificar_mensagens); se informada, a conversa processada do zero não é lida de novo
+
+    Returns:
+        Tuple contendo:
+        - DataFrame de process_whatsapp_chat com as colunas Semestre, Periodo_Semestre,
+          texto_limpo, polaridade e sentimento
+        - Origem do resultado: 'disco', 'incremental' ou None se processado do zero
+    """
+    if armazem is None:
+        return _analisar(file, progresso, cancelamento, lido), None
+
+    if file_hash is not None:
+        df = _carregar(armazem, file_hash)
+        if df is not None:
+            return df, 'disco'
+
+    file_hash, anterior, metadados = _localizar_anterior(file, armazem)
+    df = _carregar(armazem, file_hash)
+    if df is not None:
+        return df, 'disco'
+
+    tamanho_bytes = _tamanho(file)
+    if anterior is not None:
+        dialeto = obter_dialeto(metadados['dialeto'], metadados['formato_data'])
+        inicio = metadados['tamanho_bytes']
+        df_anterior = _carregar(armazem, anterior)
+        # O trecho novo precisa começar em uma mensagem ou evento do sistema; se começar no
+        # meio da última mensagem armazenada, a conversa inteira é processada de novo
+        if df_anterior is not None and dialeto.padrao_sistema.match(primeira_linha(file, inicio)):
+            novo = classificar_mensagens(process_whatsapp_chat(file, inicio=inicio, dialeto=dialeto))
+            # Uma mensagem nova anterior à última armazenada indica que a ordem dia/mês gravada
+            # estava errada (amostra ambígua): a conversa inteira é processada de novo
+            if len(novo) == 0 or novo['Data_Hora'].iloc[0] >= df_anterior['Data_Hora'].max():
+                df = _concatenar(df_anterior, _analisar(file, progresso, cancelamento, novo))
+                armazem.salvar(file_hash, df, _metadados(df, tamanho_bytes))
+                return df, 'incremental'
+
+    df = _analisar(file, progresso, cancelamento, lido)
+    armazem.salvar(file_hash, df, _metadados(df, tamanho_bytes))
+    return df, None
+
+
+def _carregar(armazem: ArmazemParquet, chave: str) -> Optional[pd.DataFrame]:
+    df = armazem.carregar(chave)
+    if df is not None:
+        # O Parquet não tem unidade de segundos e devolve Data_Hora em milissegundos
+        df['Data_Hora'] = df['Data_Hora'].astype('datetime64[s]')
+        metadados = armazem.metadados(chave) or {}
+        df.attrs['dialeto'] = metadados.get('dialeto')
+        df.attrs['formato_data'] = metadados.get('formato_data')
+        df.attrs['descartes'] = metadados.get('descartes', {})
+    return df
+
+
+def _tamanho(file) -> int:
+    """Tamanho em bytes de um caminho em disco ou UploadedFile."""
+    if isinstance(file, (str, os.PathLike)):
+        return os.path.getsize(file)
+    return file.seek(0, os.SEEK_END)
@@ -0,0 +1,75 @@
+"""
+Tarefas em segundo plano para a interface: cada tarefa executa uma função em uma thread
+própria, com aviso de progresso e cancelamento cooperativo, enquanto o script do Streamlit
+desenha as seções que já podem ser exibidas.
+"""
+import threading
+from typing import Any, Callable
+
+import desempenho
+from auxiliar import AnaliseCancelada
+
+
+class Tarefa:
+    """
+    Executa funcao(*args, progresso=..., cancelamento=...) em uma thread de fundo.
+
+    A função recebe um callback de progresso (fração de 0 a 1 e nome da etapa) e um
+    threading.Event de cancelamento, que deve verificar periodicamente; quando sinalizado,
+    ela interrompe o trabalho levantando AnaliseCancelada. A medição de desempenho segue o
+    estado da thread que criou a tarefa e as medições ficam em `medicoes`.
+    """
+
+    def __init__(self, funcao: Callable[..., Any], *args):
+        self.cancelamento = threading.Event()
+        self.progresso = 0.0
+        self.etapa = ""
+        self.medicoes = []
+        self._resultado = None
+        self._erro = None
+        self._thread = threading.Thread(
+            target=self._executar, args=(funcao, args, desempenho.ativo(), desempenho.memoria()),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _avisar(self, fracao: float, etapa: str):
+        self.progresso, self.etapa = fracao, etapa
+
+    def _executar(self, funcao, args, medir: bool, memoria: bool):
+        desempenho.ativar(medir, memoria)
+        try:
+            self._resultado = funcao(*args, progresso=self._avisar, cancelamento=self.cancelamento)
+        except BaseException as erro:  # repassado a quem pedir o resultado
+            self._erro = erro
+        finally:
+            self.medicoes = desempenho.medicoes()
+            # Libera o tracemalloc se esta era a última thread medindo memória
+            desempenho.ativar(False)
+
+    @property
+    def concluida(self) -> bool:
+        return not self._thread.is_alive()
+
+    @property
+    def cancelada(self) -> bool:
+        return self.cancelamento.is_set()
+
+    def cancelar(self):
+        """Pede o cancelamento; a função para no próximo ponto em que verifica o evento."""
+        self.cancelamento.set()
+
+    def aguardar(self, timeout: float = None) -> bool:
+        """Espera a tarefa terminar por até timeout segundos e retorna se ela terminou."""
+        self._thread.join(timeout)
+        return self.concluida
+
+    def resultado(self):
+        """Resultado da função; levanta o erro dela (ou AnaliseCancelada) se ela falhou."""
+        if not self.concluida:
+            raise RuntimeError("A tarefa ainda está em andamento")
+        if self._erro is not None:
+            raise self._erro
+        if self.cancelada:
+            raise AnaliseCancelada()
+        return self._resultado